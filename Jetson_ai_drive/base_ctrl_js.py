@@ -214,12 +214,29 @@ class BaseController:
 
     def process_commands(self):
         while True:
-            data = self.command_queue.get()
+            batch = [self.command_queue.get()]
+            # Drain whatever queued up meanwhile so the burst goes out in one write
+            while True:
+                try:
+                    batch.append(self.command_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # Latest value wins for velocity: only the newest T=13 of the burst is sent,
+            # so a final (0, 0) stop always goes out and stale speeds never back up the link
+            velocity = [i for i, data in enumerate(batch) if data.get("T") == 13]
+            if len(velocity) > 1:
+                stale = set(velocity[:-1])
+                batch = [data for i, data in enumerate(batch) if i not in stale]
+
             if self.virtual_mode:
-                print(f"가상 명령 처리: {data}")
+                for data in batch:
+                    print(f"가상 명령 처리: {data}")
             else:
                 try:
-                    self.ser.write((json.dumps(data) + '\n').encode("utf-8"))
+                    # Compact separators: fewer bytes on the 115200 baud link
+                    frame = ''.join(json.dumps(data, separators=(',', ':')) + '\n' for data in batch)
+                    self.ser.write(frame.encode("utf-8"))
                 except serial.serialutil.SerialException as e:
                     print(f"[process_commands] Serial write failed: {e}")
                     # Depending on desired behavior, might try to reconnect or just log
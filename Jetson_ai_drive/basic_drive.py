@@ -5,45 +5,111 @@ Controls: WASD for movement, Space for stop, Q to quit
 Enhanced with backward steering capabilities
 """
 
+import os
 import sys
+import fcntl
 import time
-import threading
 import tty
+import selectors
 import termios
 from base_ctrl_js import BaseController
 
 class SimpleRoverController:
+    __slots__ = ('base', 'linear_speed', 'angular_speed', 'running', '_input_char',
+                 '_last_sent', '_last_send_time', '_last_status', '_last_print')
+    
+    # Movement parameters
+    MAX_SPEED = 0.3
+    MAX_STEER = 0.2
+    
+    # Resend unchanged velocity this often so the base watchdog never times out
+    KEEPALIVE = 0.5
+    
+    # Status line refresh period (5Hz), kept off the 20Hz control cadence
+    STATUS_PERIOD = 0.2
+    
+    # Key -> (linear, angular)
+    _KEY_TABLE = {
+        'w': (MAX_SPEED, 0.0),    # Forward
+        's': (-MAX_SPEED, 0.0),   # Backward
+        ' ': (0.0, 0.0),          # Stop
+        'e': (0.5, MAX_STEER),    # Forward + Right
+        'r': (0.5, -MAX_STEER),   # Forward + Left
+        'z': (-0.5, -MAX_STEER),  # Backward + Left
+        'x': (-0.5, MAX_STEER),   # Backward + Right
+    }
+    
+    # Turn keys adapt to the current movement mode
+    _STEER_TABLE = {
+        'a': MAX_STEER,   # Turn left
+        'd': -MAX_STEER,  # Turn right
+    }
+    
     def __init__(self):
         # Initialize robot base
         self.base = BaseController('/dev/ttyUSB1', 115200)
+        self._set_low_latency('/dev/ttyUSB1')
         
-        # Movement parameters
+        # Current velocity
         self.linear_speed = 0.0
         self.angular_speed = 0.0
-        self.MAX_SPEED = 0.3
-        self.MAX_STEER = 0.2
+        
+        # Last command actually sent to the base
+        self._last_sent = (None, None)
+        self._last_send_time = 0.0
+        
+        # Last status line written to the terminal
+        self._last_status = b''
+        self._last_print = 0.0
         
         # Control flags
         self.running = True
         self._input_char = None
-        self._stop_event = threading.Event()
         
-        # Track current movement state
-        self.moving_forward = False
-        self.moving_backward = False
+    def _set_low_latency(self, port):
+        """Drop the FTDI latency timer from 16ms to 1ms so commands leave immediately"""
+        dev = os.path.basename(port)
+        try:
+            with open(f'/sys/bus/usb-serial/devices/{dev}/latency_timer', 'w') as f:
+                f.write('1')
+            return
+        except OSError:
+            pass
         
-    def _read_input(self):
-        """Read keyboard input in raw mode"""
-        fd = sys.stdin.fileno()
-        old_settings = termios.tcgetattr(fd)
+        # Fallback: set ASYNC_LOW_LATENCY via TIOCGSERIAL/TIOCSSERIAL (wrapped by pyserial)
+        ser = getattr(self.base, 'ser', None)
+        if ser is None:
+            return  # Virtual mode
         try:
-            tty.setraw(fd)
-            while not self._stop_event.is_set():
-                ch = sys.stdin.read(1)
+            ser.set_low_latency_mode(True)
+        except (AttributeError, OSError, ValueError) as e:
+            print(f"Low latency serial mode unavailable: {e}")
+        
+    def _on_stdin(self, fd):
+        """Read pending keys once stdin is readable, False once stdin is closed"""
+        try:
+            # Drain the whole burst in one syscall
+            data = os.read(fd, 32)
+        except BlockingIOError:
+            return True
+        if not data:
+            return False  # EOF: stdin stays readable forever, the caller must stop
+        
+        for b in data:
+            ch = chr(b)
+            if ch == 'q' or ch == '\x1b':
+                # Never lose a quit key inside a burst
                 self._input_char = ch
-                time.sleep(0.01)
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+                break
+            if ch in self._KEY_TABLE or ch in self._STEER_TABLE:
+                # Only the latest movement key matters
+                self._input_char = ch
+        return True
+    
+    @property
+    def direction(self):
+        """Movement mode derived from the sign of linear_speed"""
+        return 1 if self.linear_speed > 0 else -1 if self.linear_speed < 0 else 0
     
     def handle_input(self):
         """Process keyboard input"""
@@ -51,67 +117,28 @@ class SimpleRoverController:
             ch = self._input_char
             self._input_char = None
             
-            if ch == 'w':  # Forward
-                self.linear_speed = self.MAX_SPEED
-                self.angular_speed = 0.0
-                self.moving_forward = True
-                self.moving_backward = False
-            elif ch == 's':  # Backward
-                self.linear_speed = -self.MAX_SPEED
-                self.angular_speed = 0.0
-                self.moving_forward = False
-                self.moving_backward = True
-            elif ch == 'a':  # Turn left
-                self.angular_speed = self.MAX_STEER
-                if self.moving_backward:
-                    # Keep backward motion with steering
-                    self.linear_speed = -0.5
-                else:
-                    # Default forward motion for steering power
-                    self.linear_speed = 0.5
-                    self.moving_forward = True
-            elif ch == 'd':  # Turn right
-                self.angular_speed = -self.MAX_STEER
-                if self.moving_backward:
+            row = self._KEY_TABLE.get(ch)
+            if row:
+                self.linear_speed, self.angular_speed = row
+            elif ch in self._STEER_TABLE:
+                self.angular_speed = self._STEER_TABLE[ch]
+                if self.linear_speed < 0:
                     # Keep backward motion with steering
                     self.linear_speed = -0.5
                 else:
                     # Default forward motion for steering power
                     self.linear_speed = 0.5
-                    self.moving_forward = True
-            elif ch == ' ':  # Stop
-                self.linear_speed = 0.0
-                self.angular_speed = 0.0
-                self.moving_forward = False
-                self.moving_backward = False
             elif ch == 'q' or ch == '\x1b':  # Quit (q or ESC)
                 self.running = False
-                
-            # Combined movements (keeping original functionality)
-            elif ch == 'e':  # Forward + Right
-                self.linear_speed = 0.5
-                self.angular_speed = self.MAX_STEER
-                self.moving_forward = True
-                self.moving_backward = False
-            elif ch == 'r':  # Forward + Left
-                self.linear_speed = 0.5
-                self.angular_speed = -self.MAX_STEER
-                self.moving_forward = True
-                self.moving_backward = False
-            elif ch == 'z':  # Backward + Left
-                self.linear_speed = -0.5
-                self.angular_speed = -self.MAX_STEER
-                self.moving_forward = False
-                self.moving_backward = True
-            elif ch == 'x':  # Backward + Right
-                self.linear_speed = -0.5
-                self.angular_speed = self.MAX_STEER
-                self.moving_forward = False
-                self.moving_backward = True
     
     def update_robot(self):
-        """Send velocity commands to robot"""
-        self.base.base_velocity_ctrl(self.linear_speed, self.angular_speed)
+        """Send velocity commands to robot when they change (plus keepalive)"""
+        pair = (round(self.linear_speed, 3), round(self.angular_speed, 3))
+        now = time.monotonic()
+        if pair != self._last_sent or now - self._last_send_time >= self.KEEPALIVE:
+            self.base.base_velocity_ctrl(*pair)
+            self._last_sent = pair
+            self._last_send_time = now
     
     def print_status(self):
         """Print current status"""
@@ -130,12 +157,16 @@ class SimpleRoverController:
             status += " + Left turn"
             
         # Show current movement state
-        if self.moving_forward:
+        if self.direction > 0:
             status += " [FWD mode]"
-        elif self.moving_backward:
+        elif self.direction < 0:
             status += " [BWD mode]"
             
-        print(status + "  ", end='', flush=True)
+        # Only touch the terminal when the line actually changed
+        line = (status + "  ").encode()
+        if line != self._last_status:
+            os.write(sys.stdout.fileno(), line)
+            self._last_status = line
     
     def run(self):
         """Main control loop"""
@@ -152,34 +183,57 @@ class SimpleRoverController:
         print("- Then use A/D to steer while moving backward")
         print("==================================\n")
         
-        # Start input thread
-        input_thread = threading.Thread(target=self._read_input)
-        input_thread.daemon = True
-        input_thread.start()
+        fd = sys.stdin.fileno()
+        old_settings = termios.tcgetattr(fd)
+        old_flags = fcntl.fcntl(fd, fcntl.F_GETFL)
         
         try:
-            last_update = time.time()
+            tty.setraw(fd)
+            fcntl.fcntl(fd, fcntl.F_SETFL, old_flags | os.O_NONBLOCK)
+            self._control_loop(fd)
+        except KeyboardInterrupt:
+            print("\n\nCtrl+C detected. Stopping...")
+        finally:
+            # Clean shutdown
+            fcntl.fcntl(fd, fcntl.F_SETFL, old_flags)
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+            self.base.base_velocity_ctrl(0, 0)  # Stop robot
+            print("\nRobot stopped. Goodbye!")
+    
+    def _control_loop(self, fd):
+        """Fixed-rate control loop (20Hz), stdin is multiplexed in the same thread"""
+        sel = selectors.DefaultSelector()
+        sel.register(fd, selectors.EVENT_READ)
+        
+        try:
+            period = 0.05
+            next_tick = time.monotonic() + period
             
             while self.running:
+                # Wait for a key or the next tick, whichever comes first
+                timeout = next_tick - time.monotonic()
+                if timeout > 0 and sel.select(timeout):
+                    if not self._on_stdin(fd):
+                        # No more input can arrive, so halt instead of spinning on EOF
+                        sel.unregister(fd)
+                        self.linear_speed = self.angular_speed = 0
+                        self.base.base_velocity_ctrl(0, 0)
+                        self.running = False
+                        break
+                    continue
+                
                 # Handle keyboard input
                 self.handle_input()
                 
-                # Update robot at fixed intervals (20Hz)
-                current_time = time.time()
-                if current_time - last_update >= 0.05:
-                    self.update_robot()
-                    self.print_status()
-                    last_update = current_time
-                
-                time.sleep(0.01)
+                self.update_robot()
                 
-        except KeyboardInterrupt:
-            print("\n\nCtrl+C detected. Stopping...")
+                now = time.monotonic()
+                if now - self._last_print >= self.STATUS_PERIOD:
+                    self.print_status()
+                    self._last_print = now
+                next_tick += period
         finally:
-            # Clean shutdown
-            self._stop_event.set()
-            self.base.base_velocity_ctrl(0, 0)  # Stop robot
-            print("\nRobot stopped. Goodbye!")
+            sel.close()
 
 def main():
     try:
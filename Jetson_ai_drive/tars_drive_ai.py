@@ -4,23 +4,102 @@ TARS Voice-Controlled Rover with AI Personality
 Combines voice chat with rover movement control
 """
 
-import os, sys, warnings, tempfile, time, threading, re
+import os, sys, io, fcntl, warnings, time, threading, re, select, queue
 import numpy as np
-import sounddevice as sd
-import scipy.io.wavfile as wav
-import whisper, ollama
-from gtts import gTTS
+import ollama
 from base_ctrl_js import BaseController
+# Audio, Whisper and TTS libraries are imported where they are first used,
+# so the menu comes up without waiting on CUDA/PortAudio initialisation
 
-# Suppress warnings and pygame messages
+# Ollama model, kept resident between turns
+LLM_MODEL = "tars-smollm"  # built from Modelfile: ollama create tars-smollm -f Modelfile
+LLM_MODEL_HINT = f"build it with: ollama create {LLM_MODEL} -f Modelfile"
+LLM_KEEP_ALIVE = "1h"
+
+# Cap replies at the decoder, the prompt alone doesn't stop long tails
+LLM_OPTIONS = {
+    "num_ctx": 2048,
+    "num_predict": 60,
+    "stop": ["\n\n", "User:", "User message:"],
+    "temperature": 0.7,
+    "top_p": 0.9,
+}
+
+# Appended to the system prompt once, so every turn shares the same cached prefix
+LLM_INSTRUCTIONS = "IMPORTANT: Keep responses SHORT and conversational (1-2 sentences max). Don't be overly verbose."
+
+# Local Piper voice model (ONNX)
+PIPER_VOICE = "en_US-lessac-medium.onnx"  # same voice as the other Piper scripts
+
+WORD_RE = re.compile(r"[a-z]+")
+
+# End of a sentence in the streamed reply (terminator followed by whitespace)
+SENTENCE_END_RE = re.compile(r"[.!?]+\s")
+
+# Direct movement command -> trigger words, inflections included (checked in order)
+MOVE_KEYWORDS = {
+    'forward': re.compile(r"\b(forwards?|ahead)\b"),
+    'backward': re.compile(r"\b(backwards?|back(s|ing|ed)?|revers(e|es|ing|ed))\b"),
+    'left': re.compile(r"\bleft\b"),
+    'right': re.compile(r"\bright\b"),
+    'stop': re.compile(r"\b(stop(s|ping|ped)?|halt(s|ing|ed)?|freez(e|es|ing))\b"),
+}
+
+# Questions about how TARS feels
+EMOTION_CHECK_RE = re.compile(r"\bhow are you\b|\bhow do you feel\b|\bfeeling")
+
+# Emotion words in TARS' reply -> movement pattern (checked in order)
+EMOTION_MOVES = (
+    ('happy_wiggle', {'happy', 'great', 'fantastic', 'good'}),
+    ('excited_spin', {'excited', 'thrilled', 'pumped'}),
+    ('confused_sway', {'confused', 'puzzled', 'unsure'}),
+    ('sad_backup', {'sad', 'down', 'low'}),
+    ('angry_turn', {'angry', 'frustrated', 'mad'}),
+    ('tired_rock', {'tired', 'sluggish', 'sleepy'}),
+    ('nervous_jitter', {'nervous', 'anxious', 'worried'}),
+)
+
+# Expressive movements as (linear, angular, seconds) steps, the rover stops after the last one
+MOVEMENT_PATTERNS = {
+    # Forward-back-forward (longer, more expressive) plus an extra wiggle
+    'happy_wiggle': ((0.25, 0, 0.5), (-0.25, 0, 0.5), (0.25, 0, 0.5), (0, 0, 0.2), (0.15, 0, 0.3)),
+    # More dramatic spinning pattern with a final spin
+    'excited_spin': ((0.5, -0.4, 0.3), (0.5, 0.4, 0.3)) * 3 + ((0.5, -0.5, 0.4),),
+    # Contemplative slow turns
+    'thinking_turn': ((0.5, -0.15, 0.6), (0, 0, 0.3), (0.5, 0.15, 0.6), (0, 0, 0.3), (0.5, -0.15, 0.6)),
+    # Slow, dejected backward movement
+    'sad_backup': ((-0.1, 0, 0.8), (0, 0, 0.4), (-0.05, 0, 0.6)),
+    # Sharp aggressive movements
+    'angry_turn': ((0.5, -0.5, 0.3), (0.5, 0.5, 0.3), (0.5, -0.5, 0.4)),
+    # Slow, lazy rocking motion
+    'tired_rock': ((0.08, 0, 0.8), (-0.08, 0, 0.8), (0.05, 0, 0.6), (-0.05, 0, 0.6)),
+    # Inquisitive forward lean
+    'curious_lean': ((0.2, 0, 0.4), (0, 0, 0.3), (0.1, 0, 0.3)),
+    # Side-to-side confusion
+    'confused_sway': ((0.5, -0.2, 0.4), (0.5, 0.2, 0.4)) * 2,
+    # Quick nervous movements
+    'nervous_jitter': ((0.1, 0, 0.2), (-0.1, 0, 0.2)) * 4,
+    # Circular movement
+    'playful_circle': ((0.5, -0.3, 1.2),),
+    # Dance-like movement
+    'dance_wiggle': ((0.5, -0.4, 0.3), (0.5, 0.4, 0.3), (0.2, 0, 0.3), (-0.2, 0, 0.3)),
+}
+
+# Manual drive key -> ((linear, angular), status label)
+MANUAL_KEYS = {
+    'w': ((0.3, 0), "🔼 Forward    "),
+    's': ((-0.3, 0), "🔽 Backward   "),
+    'a': ((0.1, -0.3), "◀️ Left       "),
+    'd': ((0.1, 0.3), "▶️ Right      "),
+    ' ': ((0, 0), "⏹️ Stopped    "),
+}
+# Seconds without a key before manual drive stops. This must exceed the terminal's
+# key-repeat delay (~660 ms on X11/console), otherwise a held key stops the rover
+# between the first press and the first repeat. Override with TARS_MANUAL_IDLE_STOP.
+MANUAL_IDLE_STOP = float(os.environ.get("TARS_MANUAL_IDLE_STOP", "0.75"))
+
+# Suppress warnings
 warnings.filterwarnings("ignore")
-os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
-old_stdout = sys.stdout
-sys.stdout = open(os.devnull, 'w')
-import pygame
-sys.stdout.close()
-sys.stdout = old_stdout
-pygame.mixer.init()
 
 class TARSRover:
     def __init__(self):
@@ -28,7 +107,34 @@ class TARSRover:
         self.sample_rate = 16000
         self.channels = 1
         self.audio_file = "recorded_audio.wav"
-        self.recording = []
+        # Debug only: keep a WAV copy of each recording (TARS_SAVE_RECORDING=1)
+        self.save_recording = os.environ.get("TARS_SAVE_RECORDING") == "1"
+        
+        # Whisper model is loaded (and warmed up) in the background at startup
+        self.whisper_model = None
+        self._whisper_lock = threading.Lock()
+        threading.Thread(target=self.warm_up_whisper, daemon=True).start()
+        
+        # One preallocated capture buffer, reused for every recording
+        self.max_record_seconds = 60
+        self._audio_buf = np.empty(self.sample_rate * self.max_record_seconds, dtype=np.float32)
+        self._audio_pos = 0
+        
+        # Streaming transcription: audio is transcribed while recording, in windows of at
+        # least this length that are only cut at a pause, so no word straddles two windows
+        self.stream_window = 2.0  # seconds
+        self._pause_pos = 0  # buffer position inside the latest pause (set by the VAD callback)
+        self._audio_ready = threading.Event()
+        self._recording_done = threading.Event()
+        self._partial_transcript = []
+        self._transcribe_thread = None
+        
+        # Voice activity detection ends the recording after this much silence following speech
+        self.vad_frame = int(self.sample_rate * 0.03)  # webrtcvad takes 10/20/30 ms frames
+        self.vad_silence_ms = 600
+        self.vad_pause_ms = 150  # silence this long is a safe place to cut a window
+        self._vad_stop_r, self._vad_stop_w = os.pipe()
+        fcntl.fcntl(self._vad_stop_r, fcntl.F_SETFL, os.O_NONBLOCK)
         
         # Rover setup
         try:
@@ -52,6 +158,20 @@ class TARSRover:
         
         # Load TARS system prompt
         self.load_prompt()
+        self.warm_up_llm()
+        
+        # On-device TTS, Google TTS is only used when Piper is unavailable.
+        # The voice is loaded by the TTS worker so startup doesn't wait on it
+        self.tts_voice = None
+        
+        # Sentences are spoken by one worker, in order, while the reply is still generating
+        self._tts_q = queue.Queue()
+        self.speech_interrupted = threading.Event()
+        # Self-pipe written by the playback stream when it finishes, so waiting
+        # for speech is a single select on stdin + this pipe with no polling
+        self._speech_done_r, self._speech_done_w = os.pipe()
+        fcntl.fcntl(self._speech_done_r, fcntl.F_SETFL, os.O_NONBLOCK)
+        threading.Thread(target=self._tts_worker, daemon=True).start()
         
         # Movement control
         self.movement_thread = None
@@ -66,69 +186,242 @@ class TARSRover:
         except FileNotFoundError:
             print("⚠️  prompt.txt not found, using basic prompt")
             self.system_prompt = self.get_default_prompt()
+        self.system_message = {'role': 'system', 'content': f"{self.system_prompt}\n\n{LLM_INSTRUCTIONS}"}
+            
+    def warm_up_llm(self):
+        """Load the LLM into memory now so the first reply is not a cold start"""
+        try:
+            ollama.generate(model=LLM_MODEL, prompt="", keep_alive=LLM_KEEP_ALIVE)
+        except ollama.ResponseError as e:
+            # Server is up but the custom model has not been created yet
+            print(f"⚠️  Ollama warm-up failed: {e.error} ({LLM_MODEL_HINT})")
+        except Exception as e:
+            print(f"⚠️  Ollama warm-up failed: {e}")
             
     def get_default_prompt(self):
         """Default TARS prompt if file not found"""
-        return f"""You are TARS, a friendly robotic rover companion. 
-        Current settings: Humor {self.humor_level}%, Honesty {self.honesty_level}%, Security {self.security_level}%.
+        return """You are TARS, a friendly robotic rover companion. 
         Express emotions through movement when asked how you feel.
         Respond to movement commands with robotic acknowledgments."""
         
     def record_audio(self):
-        """Record audio until Enter is pressed"""
-        self.recording = []
-        print("🎙️  TARS listening... (Press Enter to stop)")
+        """Record audio until the speaker goes quiet (or Enter is pressed), transcribing in the background"""
+        self._audio_pos = 0
+        self._pause_pos = 0
+        self._partial_transcript = []
+        self._audio_ready.clear()
+        self._recording_done.clear()
+        self._transcribe_thread = threading.Thread(target=self._transcribe_worker, daemon=True)
+        self._transcribe_thread.start()
+        import sounddevice as sd
+        try:
+            import webrtcvad  # pip install webrtcvad
+            vad = webrtcvad.Vad(2)
+            print("🎙️  TARS listening... (Stop talking or press Enter to finish)")
+        except ImportError:
+            vad = None
+            print("🎙️  TARS listening... (Press Enter to stop)")
+            
+        # Drop a stop signal left over from the previous recording
+        try:
+            os.read(self._vad_stop_r, 64)
+        except BlockingIOError:
+            pass
+            
+        speech_end = 0  # buffer position just after the last voiced frame
+        silence_ms = 0
         
         def callback(indata, frames, time_info, status):
-            self.recording.append(indata.copy())
+            nonlocal speech_end, silence_ms
+            # Copy straight into the capture buffer (anything past max_record_seconds is dropped)
+            pos = self._audio_pos
+            n = min(len(indata), len(self._audio_buf) - pos)
+            self._audio_buf[pos:pos + n] = indata[:n, 0]
+            self._audio_pos = pos + n
+            self._audio_ready.set()
             
-        with sd.InputStream(samplerate=self.sample_rate, channels=self.channels, callback=callback):
-            input()
+            if vad is None or frames != self.vad_frame:
+                return
+            pcm = (indata[:, 0] * 32767).astype(np.int16).tobytes()
+            if vad.is_speech(pcm, self.sample_rate):
+                speech_end = pos + n
+                silence_ms = 0
+            elif speech_end:
+                silence_ms += 30
+                if silence_ms >= self.vad_pause_ms:
+                    self._pause_pos = pos + n
+                if silence_ms == self.vad_silence_ms:
+                    os.write(self._vad_stop_w, b'x')
+                    
+        with sd.InputStream(samplerate=self.sample_rate, channels=self.channels,
+                            blocksize=self.vad_frame, callback=callback):
+            # Wake on Enter or on the VAD stop signal, whichever comes first
+            ready = select.select([sys.stdin, self._vad_stop_r], [], [])[0]
+            if sys.stdin in ready:
+                sys.stdin.readline()
+                
+        # Trim the trailing silence, keeping one frame of context for Whisper
+        if speech_end:
+            self._audio_pos = min(self._audio_pos, speech_end + self.vad_frame)
+        self._recording_done.set()
+        self._audio_ready.set()
             
-        audio_data = np.concatenate(self.recording, axis=0)
-        wav.write(self.audio_file, self.sample_rate, audio_data)
+        # Whisper gets the float32 samples directly, the WAV is only for debugging
+        if self.save_recording:
+            import scipy.io.wavfile as wav
+            wav.write(self.audio_file, self.sample_rate, self._audio_buf[:self._audio_pos])
         print(f"✅ Audio captured")
         
+    def get_whisper_model(self):
+        """Load the Whisper model on first use"""
+        with self._whisper_lock:
+            if self.whisper_model is None:
+                import ctranslate2
+                from faster_whisper import WhisperModel
+                # FP16 on the Jetson GPU, int8 when falling back to the CPU
+                if ctranslate2.get_cuda_device_count() > 0:
+                    self.whisper_model = WhisperModel("base", device="cuda", compute_type="float16")
+                else:
+                    self.whisper_model = WhisperModel("base", device="cpu", compute_type="int8")
+        return self.whisper_model
+        
+    def warm_up_whisper(self):
+        """Load Whisper and run 1 s of silence through it so the first utterance skips kernel setup"""
+        try:
+            segments, _ = self.get_whisper_model().transcribe(np.zeros(self.sample_rate, dtype=np.float32), beam_size=1)
+            list(segments)  # segments are lazy, consume them to actually run the model
+        except Exception as e:
+            print(f"⚠️  Whisper warm-up failed: {e}")
+        
+    def _transcribe_worker(self):
+        """Transcribe audio up to each pause while the user is still speaking"""
+        model = self.get_whisper_model()
+        window = int(self.sample_rate * self.stream_window)
+        start = 0
+        
+        while True:
+            self._audio_ready.wait()
+            self._audio_ready.clear()
+            # Check done first so the position read after it is final; until then only
+            # cut at a pause (without VAD there are none and it all goes in one pass at the end)
+            done = self._recording_done.is_set()
+            end = self._audio_pos if done else self._pause_pos
+            if end - start < window and not done:
+                continue
+                
+            if end > start:
+                # Condition on what was already heard so words carry across windows
+                segments, _ = model.transcribe(self._audio_buf[start:end], beam_size=1, vad_filter=True,
+                                               initial_prompt=" ".join(self._partial_transcript) or None)
+                text = "".join(segment.text for segment in segments).strip()
+                if text:
+                    self._partial_transcript.append(text)
+                start = end
+                
+            if done:
+                break
+        
     def transcribe_audio(self):
-        """Transcribe recorded audio to text"""
+        """Finish transcribing the recorded audio and return the text"""
         print("📝 Processing...")
-        model = whisper.load_model("base")
-        result = model.transcribe(self.audio_file, fp16=False)
-        text = result["text"].strip()
+        # Only the tail window is left to transcribe at this point
+        self._transcribe_thread.join()
+        text = " ".join(self._partial_transcript)
         print(f"💬 You: {text}")
         return text
         
+    def load_tts_voice(self):
+        """Load the local Piper voice once"""
+        try:
+            from piper import PiperVoice  # pip install piper-tts
+        except ImportError:
+            print("⚠️  piper-tts not installed, using Google TTS")
+            return None
+        try:
+            voice = PiperVoice.load(PIPER_VOICE)
+            print("🔊 Piper voice loaded!")
+            return voice
+        except Exception as e:
+            print(f"⚠️  Piper voice failed to load ({e}), using Google TTS")
+            return None
+            
     def speak(self, text):
-        """Convert text to speech using Google TTS with Q key interrupt"""
+        """Convert text to speech (Piper, or Google TTS fallback) with Q key interrupt"""
         if not text.strip():
             return
             
         try:
-            tts = gTTS(text=text, lang='en')
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp:
-                temp_file = tmp.name
+            if self.tts_voice is not None:
+                self.speak_piper(text)
+            else:
+                self.speak_gtts(text)
+        except Exception as e:
+            print(f"🔇 TTS Error: {e}")
+            
+    def _tts_worker(self):
+        """Speak queued sentences one at a time, skipping the rest after an interrupt"""
+        self.tts_voice = self.load_tts_voice()
+        while True:
+            sentence = self._tts_q.get()
+            try:
+                if not self.speech_interrupted.is_set():
+                    self.speak(sentence)
+            finally:
+                self._tts_q.task_done()
+                
+    def speak_piper(self, text):
+        """Synthesize locally to PCM and play it, no network or temp file"""
+        # piper-tts >= 1.3 yields one AudioChunk per sentence
+        pcm = b"".join(chunk.audio_int16_bytes for chunk in self.tts_voice.synthesize(text))
+        self.play_pcm(np.frombuffer(pcm, dtype=np.int16), self.tts_voice.config.sample_rate)
+        
+    def speak_gtts(self, text):
+        """Convert text to speech using Google TTS, decoded in memory"""
+        from gtts import gTTS
+        import miniaudio  # pip install miniaudio (decodes the gTTS MP3)
+        mp3 = io.BytesIO()
+        gTTS(text=text, lang='en').write_to_fp(mp3)
+        decoded = miniaudio.decode(mp3.getvalue(), output_format=miniaudio.SampleFormat.SIGNED16,
+                                   nchannels=1, sample_rate=24000)
+        self.play_pcm(np.frombuffer(decoded.samples, dtype=np.int16), decoded.sample_rate)
+        
+    def play_pcm(self, audio, samplerate):
+        """Play mono int16 PCM from a sounddevice callback stream"""
+        import sounddevice as sd
+        pos = 0
+        
+        def callback(outdata, frames, time_info, status):
+            nonlocal pos
+            chunk = audio[pos:pos + frames]
+            outdata[:len(chunk), 0] = chunk
+            pos += len(chunk)
+            if len(chunk) < frames:
+                outdata[len(chunk):] = 0
+                raise sd.CallbackStop
                 
-            tts.save(temp_file)
-            pygame.mixer.music.load(temp_file)
-            pygame.mixer.music.play()
+        # Drop any leftover signal from the previous (aborted) stream
+        try:
+            os.read(self._speech_done_r, 64)
+        except BlockingIOError:
+            pass
             
-            print("🔇 (Press 'q' + Enter to interrupt speech)")
+        stream = sd.OutputStream(samplerate=samplerate, channels=1, dtype='int16', callback=callback,
+                                 finished_callback=lambda: os.write(self._speech_done_w, b'x'))
+        with stream:
+            self.wait_for_speech(stream.abort)
             
-            # Check for 'q' key interrupt while speaking
-            import select
-            while pygame.mixer.music.get_busy():
-                # Check if input is available (non-blocking)
-                if select.select([sys.stdin], [], [], 0.1)[0]:
-                    user_input = sys.stdin.readline().strip().lower()
-                    if user_input == 'q':
-                        pygame.mixer.music.stop()
-                        print("🤐 TARS speech interrupted!")
-                        break
-                time.sleep(0.1)
-                
-            os.unlink(temp_file)
-        except Exception as e:
-            print(f"🔇 TTS Error: {e}")
+    def wait_for_speech(self, stop):
+        """Block until playback finishes, 'q' + Enter interrupts it (and any queued sentences)"""
+        while True:
+            ready = select.select([sys.stdin, self._speech_done_r], [], [])[0]
+            if self._speech_done_r in ready:
+                break
+            user_input = sys.stdin.readline().strip().lower()
+            if user_input == 'q':
+                self.speech_interrupted.set()
+                stop()
+                print("🤐 TARS speech interrupted!")
+                break
             
     def execute_movement(self, movement_pattern, duration=1.0):
         """Execute movement pattern for emotional expression"""
@@ -138,116 +431,9 @@ class TARSRover:
             
         def movement_worker():
             try:
-                if movement_pattern == "happy_wiggle":
-                    # Forward-back-forward (longer, more expressive)
-                    self.base.base_velocity_ctrl(0.25, 0)
-                    time.sleep(0.5)
-                    self.base.base_velocity_ctrl(-0.25, 0)
-                    time.sleep(0.5)
-                    self.base.base_velocity_ctrl(0.25, 0)
-                    time.sleep(0.5)
-                    self.base.base_velocity_ctrl(0, 0)
-                    time.sleep(0.2)
-                    # Extra wiggle
-                    self.base.base_velocity_ctrl(0.15, 0)
-                    time.sleep(0.3)
-                    
-                elif movement_pattern == "excited_spin":
-                    # More dramatic spinning pattern
-                    for _ in range(3):
-                        self.base.base_velocity_ctrl(0.5, -0.4)
-                        time.sleep(0.3)
-                        self.base.base_velocity_ctrl(0.5, 0.4)
-                        time.sleep(0.3)
-                    # Final spin
-                    self.base.base_velocity_ctrl(0.5, -0.5)
-                    time.sleep(0.4)
-                        
-                elif movement_pattern == "thinking_turn":
-                    # Contemplative slow turns
-                    self.base.base_velocity_ctrl(0.5, -0.15)
-                    time.sleep(0.6)
-                    self.base.base_velocity_ctrl(0, 0)
-                    time.sleep(0.3)
-                    self.base.base_velocity_ctrl(0.5, 0.15)
-                    time.sleep(0.6)
-                    self.base.base_velocity_ctrl(0, 0)
-                    time.sleep(0.3)
-                    self.base.base_velocity_ctrl(0.5, -0.15)
-                    time.sleep(0.6)
-                    
-                elif movement_pattern == "sad_backup":
-                    # Slow, dejected backward movement
-                    self.base.base_velocity_ctrl(-0.1, 0)
-                    time.sleep(0.8)
-                    self.base.base_velocity_ctrl(0, 0)
-                    time.sleep(0.4)
-                    self.base.base_velocity_ctrl(-0.05, 0)
-                    time.sleep(0.6)
-                    
-                elif movement_pattern == "angry_turn":
-                    # Sharp aggressive movements
-                    self.base.base_velocity_ctrl(0.5, -0.5)
-                    time.sleep(0.3)
-                    self.base.base_velocity_ctrl(0.5, 0.5)
-                    time.sleep(0.3)
-                    self.base.base_velocity_ctrl(0.5, -0.5)
-                    time.sleep(0.4)
-                    
-                elif movement_pattern == "tired_rock":
-                    # Slow, lazy rocking motion
-                    self.base.base_velocity_ctrl(0.08, 0)
-                    time.sleep(0.8)
-                    self.base.base_velocity_ctrl(-0.08, 0)
-                    time.sleep(0.8)
-                    self.base.base_velocity_ctrl(0.05, 0)
-                    time.sleep(0.6)
-                    self.base.base_velocity_ctrl(-0.05, 0)
-                    time.sleep(0.6)
-                    
-                elif movement_pattern == "curious_lean":
-                    # Inquisitive forward lean
-                    self.base.base_velocity_ctrl(0.2, 0)
-                    time.sleep(0.4)
-                    self.base.base_velocity_ctrl(0, 0)
-                    time.sleep(0.3)
-                    self.base.base_velocity_ctrl(0.1, 0)
-                    time.sleep(0.3)
-                    
-                elif movement_pattern == "confused_sway":
-                    # Side-to-side confusion
-                    self.base.base_velocity_ctrl(0.5, -0.2)
-                    time.sleep(0.4)
-                    self.base.base_velocity_ctrl(0.5, 0.2)
-                    time.sleep(0.4)
-                    self.base.base_velocity_ctrl(0.5, -0.2)
-                    time.sleep(0.4)
-                    self.base.base_velocity_ctrl(0.5, 0.2)
-                    time.sleep(0.4)
-                    
-                elif movement_pattern == "nervous_jitter":
-                    # Quick nervous movements
-                    for _ in range(4):
-                        self.base.base_velocity_ctrl(0.1, 0)
-                        time.sleep(0.2)
-                        self.base.base_velocity_ctrl(-0.1, 0)
-                        time.sleep(0.2)
-                        
-                elif movement_pattern == "playful_circle":
-                    # Circular movement
-                    self.base.base_velocity_ctrl(0.5, -0.3)
-                    time.sleep(1.2)
-                    
-                elif movement_pattern == "dance_wiggle":
-                    # Dance-like movement
-                    self.base.base_velocity_ctrl(0.5, -0.4)
-                    time.sleep(0.3)
-                    self.base.base_velocity_ctrl(0.5, 0.4)
-                    time.sleep(0.3)
-                    self.base.base_velocity_ctrl(0.2, 0)
-                    time.sleep(0.3)
-                    self.base.base_velocity_ctrl(-0.2, 0)
-                    time.sleep(0.3)
+                for linear, angular, seconds in MOVEMENT_PATTERNS.get(movement_pattern, ()):
+                    self.base.base_velocity_ctrl(linear, angular)
+                    time.sleep(seconds)
                     
                 # Always stop after movement
                 self.base.base_velocity_ctrl(0, 0)
@@ -269,19 +455,12 @@ class TARSRover:
         text_lower = text.lower()
         
         # Direct movement commands
-        if any(word in text_lower for word in ['forward', 'ahead', 'move forward']):
-            return 'forward'
-        elif any(word in text_lower for word in ['backward', 'back', 'reverse']):
-            return 'backward'
-        elif any(word in text_lower for word in ['left', 'turn left']):
-            return 'left'
-        elif any(word in text_lower for word in ['right', 'turn right']):
-            return 'right'
-        elif any(word in text_lower for word in ['stop', 'halt', 'freeze']):
-            return 'stop'
-            
+        for command, pattern in MOVE_KEYWORDS.items():
+            if pattern.search(text_lower):
+                return command
+                
         # Emotional states that trigger movement
-        elif any(word in text_lower for word in ['how are you', 'how do you feel', 'feeling']):
+        if EMOTION_CHECK_RE.search(text_lower):
             return 'emotion_check'
             
         return None
@@ -327,86 +506,83 @@ class TARSRover:
         """Send message to TARS AI and get response with movement"""
         print("🤖 TARS: ", end='', flush=True)
         response_parts = []
+        self.speech_interrupted.clear()
         
         try:
             # Check for movement commands
             movement_cmd = self.parse_movement_commands(message)
             
+            # Movement that doesn't depend on the reply starts right away
+            if movement_cmd in ['forward', 'backward', 'left', 'right', 'stop']:
+                # Execute direct movement command
+                print(f"🎮 Executing movement: {movement_cmd}")
+                threading.Thread(target=self.execute_direct_movement, args=(movement_cmd,), daemon=True).start()
+            elif movement_cmd != 'emotion_check':
+                # Random movement for general conversation
+                self.execute_movement(self.get_random_movement())
+            
             # Check for setting adjustments
             if 'humor' in message.lower() and any(char.isdigit() for char in message):
                 numbers = re.findall(r'\d+', message)
                 if numbers:
                     self.humor_level = min(int(numbers[0]), 100)
                     
-            # Build context-aware prompt
-            full_prompt = f"{self.system_prompt}\n\nCurrent settings: Humor {self.humor_level}%, Honesty {self.honesty_level}%, Security {self.security_level}%\n\nIMPORTANT: Keep responses SHORT and conversational (1-2 sentences max). Don't be overly verbose.\n\nUser message: {message}"
+            # The system prompt never changes, so Ollama reuses its cached prefix;
+            # only the short settings line and the message are prefilled each turn
+            settings = f"Current settings: Humor {self.humor_level}%, Honesty {self.honesty_level}%, Security {self.security_level}%"
             
             stream = ollama.chat(
-                model="smollm2",
-                messages=[{'role': 'system', 'content': full_prompt},
-                         {'role': 'user', 'content': message}],
-                stream=True
+                model=LLM_MODEL,
+                messages=[self.system_message,
+                         {'role': 'user', 'content': f"{settings}\n\n{message}"}],
+                stream=True,
+                options=LLM_OPTIONS,
+                keep_alive=LLM_KEEP_ALIVE
             )
             
+            pending = ""
             for chunk in stream:
                 content = chunk['message']['content']
                 print(content, end='', flush=True)
                 response_parts.append(content)
                 
+                # Queue each finished sentence so speech starts before generation ends
+                pending += content
+                match = SENTENCE_END_RE.search(pending)
+                while match:
+                    self._tts_q.put(pending[:match.end()].strip())
+                    pending = pending[match.end():]
+                    match = SENTENCE_END_RE.search(pending)
+                
             print()  # New line
-            response = ''.join(response_parts)
-            
-            # Always do movement before speaking
-            print("🎭 TARS expressing through movement...")
+            if pending.strip():
+                self._tts_q.put(pending.strip())
+            print("🔇 (Press 'q' + Enter to interrupt speech)")
             
-            # Execute movements based on commands or emotional responses
             if movement_cmd == 'emotion_check':
-                # TARS expressing emotion through movement
-                if any(word in response.lower() for word in ['happy', 'great', 'fantastic', 'good']):
-                    self.execute_movement('happy_wiggle')
-                elif any(word in response.lower() for word in ['excited', 'thrilled', 'pumped']):
-                    self.execute_movement('excited_spin')
-                elif any(word in response.lower() for word in ['confused', 'puzzled', 'unsure']):
-                    self.execute_movement('confused_sway')
-                elif any(word in response.lower() for word in ['sad', 'down', 'low']):
-                    self.execute_movement('sad_backup')
-                elif any(word in response.lower() for word in ['angry', 'frustrated', 'mad']):
-                    self.execute_movement('angry_turn')
-                elif any(word in response.lower() for word in ['tired', 'sluggish', 'sleepy']):
-                    self.execute_movement('tired_rock')
-                elif any(word in response.lower() for word in ['nervous', 'anxious', 'worried']):
-                    self.execute_movement('nervous_jitter')
-                else:
-                    self.execute_movement('curious_lean')
-                    
-            elif movement_cmd in ['forward', 'backward', 'left', 'right', 'stop']:
-                # Execute direct movement command
-                print(f"🎮 Executing movement: {movement_cmd}")
-                threading.Thread(target=self.execute_direct_movement, args=(movement_cmd,), daemon=True).start()
-                
-            else:
-                # Random movement for general conversation
-                random_movement = self.get_random_movement()
-                self.execute_movement(random_movement)
-            
-            # Wait for movement to complete before speaking
-            if self.movement_thread:
-                self.movement_thread.join(timeout=5)  # Wait up to 5 seconds
-            
-            # Speak the response
-            if response.strip():
-                self.speak(response)
+                # TARS expressing emotion through movement, picked from the finished reply
+                print("🎭 TARS expressing through movement...")
+                reply_words = set(WORD_RE.findall(''.join(response_parts).lower()))
+                pattern = next((pattern for pattern, keywords in EMOTION_MOVES if reply_words & keywords),
+                               'curious_lean')
+                self.execute_movement(pattern)
                 
         except Exception as e:
             error_msg = f"Error: {e}"
+            if isinstance(e, ollama.ResponseError):
+                error_msg += f" ({LLM_MODEL_HINT})"
             print(error_msg)
-            self.speak("Sorry, I encountered an error.")
+            self._tts_q.put("Sorry, I encountered an error.")
+            
+        # Return once everything queued has been spoken (or interrupted)
+        self._tts_q.join()
             
     def run(self):
         """Main TARS interaction loop"""
         print("🤖 TARS Voice-Controlled Rover (Ctrl+C to exit)")
         print(f"🎭 Personality: Humor {self.humor_level}% | Honesty {self.honesty_level}% | Security {self.security_level}%")
-        print("🌐 Requires: Ollama + smollm2 | Internet for TTS")
+        print(f"🌐 Requires: Ollama + {LLM_MODEL} | Piper voice (or Internet for Google TTS)")
+        print(f"📋 First run? Build the model: ollama create {LLM_MODEL} -f Modelfile")
         if not self.rover_connected:
             print("⚠️  Running in simulation mode (no rover)")
         print("-" * 60)
@@ -443,7 +619,6 @@ class TARSRover:
         finally:
             if self.rover_connected:
                 self.base.base_velocity_ctrl(0, 0)  # Stop rover
-            pygame.mixer.quit()
             print("\n👋 TARS shutting down. Stay awesome, friend!")
             
     def manual_drive_mode(self):
@@ -457,26 +632,24 @@ class TARSRover:
             tty.setraw(fd)
             print("Manual drive active! WASD to move, Space=stop, Q=quit")
             
+            moving = False
             while True:
-                ch = sys.stdin.read(1)
-                
-                if ch == 'w':
-                    self.base.base_velocity_ctrl(0.3, 0)
-                    print("\r🔼 Forward    ", end='', flush=True)
-                elif ch == 's':
-                    self.base.base_velocity_ctrl(-0.3, 0)
-                    print("\r🔽 Backward   ", end='', flush=True)
-                elif ch == 'a':
-                    self.base.base_velocity_ctrl(0.1, -0.3)
-                    print("\r◀️ Left       ", end='', flush=True)
-                elif ch == 'd':
-                    self.base.base_velocity_ctrl(0.1, 0.3)
-                    print("\r▶️ Right      ", end='', flush=True)
-                elif ch == ' ':
-                    self.base.base_velocity_ctrl(0, 0)
-                    print("\r⏹️ Stopped    ", end='', flush=True)
-                elif ch == 'q':
+                # Terminals have no key-up event: stop once keys (and key repeat) go quiet
+                if not select.select([fd], [], [], MANUAL_IDLE_STOP)[0]:
+                    if moving:
+                        self.base.base_velocity_ctrl(0, 0)
+                        print("\r⏹️ Stopped    ", end='', flush=True)
+                        moving = False
+                    continue
+                    
+                ch = os.read(fd, 1).decode(errors="ignore")  # unbuffered, so select sees every key
+                if ch == 'q':
                     break
+                if ch in MANUAL_KEYS:
+                    (linear, angular), label = MANUAL_KEYS[ch]
+                    self.base.base_velocity_ctrl(linear, angular)
+                    print(f"\r{label}", end='', flush=True)
+                    moving = (linear, angular) != (0, 0)
                     
         finally:
             termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
@@ -2,15 +2,20 @@
 """Lightweight Ollama Phi-4 Terminal Client with Jetson support"""
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import sys
 import time
 
+# Reuse keep-alive connections to the Ollama daemon across messages
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
 def check_ollama_status(base_url="http://localhost:11434"):
     """Check if Ollama is running and what models are available"""
     try:
         # Check if Ollama is running
-        response = requests.get(f"{base_url}/api/tags", timeout=5)
+        response = SESSION.get(f"{base_url}/api/tags", timeout=5)
         if response.status_code == 200:
             models = response.json().get('models', [])
             print(f"✅ Ollama is running at {base_url}")
@@ -37,14 +42,19 @@ def chat_with_phi4(message, url="http://localhost:11434/api/generate", model="ph
         "model": model,
         "prompt": message,
         "stream": True,
+        "keep_alive": "30m",  # Keep the model loaded between messages
         "options": {
             "num_gpu": -1 if use_gpu else 0,  # -1 uses all available GPUs, 0 uses CPU only
-            "num_thread": 4 if not use_gpu else None  # CPU threads when not using GPU
+            "num_thread": 4 if not use_gpu else None,  # CPU threads when not using GPU
+            "num_predict": 60,  # Hard cap on reply length
+            "stop": ["\n\n", "User:", "User message:"],
+            "temperature": 0.7,
+            "top_p": 0.9
         }
     }
     
     try:
-        response = requests.post(url, json=payload, stream=True, timeout=30)
+        response = SESSION.post(url, json=payload, stream=True, timeout=30)
         response.raise_for_status()
         
         print("🤖 Phi-4: ", end='', flush=True)
@@ -2,9 +2,14 @@
 """Lightweight Ollama Phi-4 Terminal Client"""
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import sys
 
+# Reuse keep-alive connections to the Ollama daemon across messages
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
 def chat_with_phi4(message, url="http://localhost:11434/api/generate", model="phi4-mini"):
     """Send message to Ollama and stream response"""
     payload = {
@@ -14,7 +19,7 @@ def chat_with_phi4(message, url="http://localhost:11434/api/generate", model="ph
     }
     
     try:
-        response = requests.post(url, json=payload, stream=True)
+        response = SESSION.post(url, json=payload, stream=True)
         response.raise_for_status()
         
         print("🤖 Phi-4: ", end='', flush=True)
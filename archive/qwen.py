@@ -1,36 +1,70 @@
 #!/usr/bin/env python3
 """Lightweight Ollama Terminal Client"""
-import requests
-import json
+import ollama  # pip install ollama
 import sys
 import re
 
-def chat_with_ollama(message, url="http://localhost:11434/api/generate", model="qwen3:1.7b"):
-    """Send message to Ollama and stream response"""
-    payload = {
-        "model": model,
-        "prompt": message,
-        "stream": True
-    }
+THINK_TAG_RE = re.compile(r'<think>|</think>')
+THINK_TAG_MAX = len('</think>')
+
+def filter_think(chunks):
+    """Yield streamed text as it arrives, dropping <think>...</think> spans"""
+    buf = ""
+    in_think = False
+    skip_ws = True  # Drop whitespace at the start and right after </think>
+    
+    for chunk in chunks:
+        buf += chunk
+        pieces = []
+        
+        # Toggle on every complete tag in the buffer
+        m = THINK_TAG_RE.search(buf)
+        while m:
+            if not in_think:
+                pieces.append(buf[:m.start()])
+            in_think = m.group() == '<think>'
+            if not in_think:
+                pieces.append(None)  # Marks a </think>: strip the whitespace after it
+            buf = buf[m.end():]
+            m = THINK_TAG_RE.search(buf)
+        
+        # Hold back a trailing '<...' that may be the start of a tag split across chunks
+        cut = buf.rfind('<', max(0, len(buf) - THINK_TAG_MAX + 1))
+        if cut < 0:
+            cut = len(buf)
+        if not in_think:
+            pieces.append(buf[:cut])
+        buf = buf[cut:]
+        
+        visible = []
+        for piece in pieces:
+            if piece is None:
+                skip_ws = True
+                continue
+            if skip_ws:
+                piece = piece.lstrip()
+                skip_ws = not piece
+            visible.append(piece)
+        
+        text = ''.join(visible)
+        if text:
+            yield text
     
+    if not in_think and buf:
+        yield buf.lstrip() if skip_ws else buf
+
+def chat_with_ollama(message, model="qwen3:1.7b"):
+    """Send message to Ollama and stream response"""
     try:
-        response = requests.post(url, json=payload, stream=True)
-        response.raise_for_status()
+        stream = ollama.generate(model=model, prompt=message, stream=True)
         
         print("🤖 Assistant: ", end='', flush=True)
         
-        full_response = ""
-        for line in response.iter_lines():
-            if line:
-                data = json.loads(line)
-                if 'response' in data:
-                    full_response += data['response']
-                if data.get('done', False):
-                    break
-        
-        # Filter out content between <think> and </think> tags
-        filtered_response = re.sub(r'<think>.*?</think>\s*', '', full_response, flags=re.DOTALL)
-        print(filtered_response.strip())
+        # Print visible text immediately, hiding the model's <think> section
+        for text in filter_think(chunk['response'] for chunk in stream):
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        print()  # New line
         
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -1,30 +1,17 @@
 #!/usr/bin/env python3
 """Lightweight Ollama smollm2 Terminal Client"""
 
-import requests
-import json
+import ollama  # pip install ollama
 import sys
 
-def chat_with_phi4(message, url="http://localhost:11434/api/generate", model="smollm2"):
+def chat_with_phi4(message, model="tars-smollm"):
     """Send message to Ollama and stream response"""
-    payload = {
-        "model": model,
-        "prompt": message,
-        "stream": True
-    }
-    
     try:
-        response = requests.post(url, json=payload, stream=True)
-        response.raise_for_status()
+        stream = ollama.generate(model=model, prompt=message, stream=True)
         
         print("🤖 AI: ", end='', flush=True)
-        for line in response.iter_lines():
-            if line:
-                data = json.loads(line)
-                if 'response' in data:
-                    print(data['response'], end='', flush=True)
-                if data.get('done', False):
-                    break
+        for chunk in stream:
+            print(chunk['response'], end='', flush=True)
         print()  # New line
         
     except Exception as e:
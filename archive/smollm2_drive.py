@@ -1,9 +1,25 @@
 #!/usr/bin/env python3
 """Robust Robotic Driving Assistant with better error handling and command detection"""
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import sys
 import re
+import time
+import queue
+import threading
+from functools import lru_cache
+
+try:
+    import orjson  # pip install orjson (faster parsing of the streamed NDJSON)
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# One warm keep-alive connection to the Ollama daemon, reused every turn
+SESSION = requests.Session()
+SESSION.headers["Connection"] = "keep-alive"
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
 
 # More explicit system prompt with better structure
 SYSTEM_PROMPT = """You are a robotic driving assistant. Follow these rules EXACTLY:
@@ -59,6 +75,77 @@ Assistant: That'll be $12.50 for an 8.2 km ride in 15 minutes. Thank you!
 
 CRITICAL: Only output JSON for navigation and manual commands. For unclear inputs, ask for clarification."""
 
+# Precompiled patterns used on every reply / streamed chunk
+JSON_LINE_RE = re.compile(r'JSON:\s*({.*})', re.IGNORECASE)
+TYPE_HINT_RE = re.compile(r'[ \t]*\(Type:[^)]*\)[ \t]*')
+
+# Manual command phrase -> action (table order is the priority when several match).
+# Matching is whole-word, so plural and -ing forms are listed explicitly.
+MANUAL_COMMANDS = {
+    'stop': 'stop',
+    'stops': 'stop',
+    'stopping': 'stop',
+    'stopped': 'stop',
+    'forward': 'go_forward',
+    'forwards': 'go_forward',
+    'go forward': 'go_forward',
+    'go forwards': 'go_forward',
+    'move forward': 'go_forward',
+    'move forwards': 'go_forward',
+    'backward': 'go_backward',
+    'backwards': 'go_backward',
+    'go backward': 'go_backward',
+    'go backwards': 'go_backward',
+    'reverse': 'go_backward',
+    'reversing': 'go_backward',
+    'left': 'turn_left',
+    'turn left': 'turn_left',
+    'go left': 'turn_left',
+    'right': 'turn_right',
+    'turn right': 'turn_right',
+    'go right': 'turn_right',
+    'turn around': 'turn_around',
+    'u-turn': 'turn_around'
+}
+MANUAL_PRIORITY = {cmd: i for i, cmd in enumerate(MANUAL_COMMANDS)}
+
+# Canned replies for manual commands answered without the LLM
+MANUAL_REPLIES = {
+    'stop': "Stopping the vehicle now.",
+    'go_forward': "Moving forward.",
+    'go_backward': "Backing up now.",
+    'turn_left': "Turning left.",
+    'turn_right': "Turning right.",
+    'turn_around': "Turning around."
+}
+
+# Destination word -> standard destination
+DESTINATIONS = {
+    'home': 'home',
+    'house': 'home',
+    'office': 'office',
+    'work': 'office',
+    'school': 'school',
+    'airport': 'airport'
+}
+
+
+def _word_alternation(words):
+    """One whole-word regex for all the words, longest first so phrases beat their parts"""
+    return re.compile(r'\b(' + '|'.join(re.escape(w) for w in sorted(words, key=len, reverse=True)) + r')\b')
+
+
+MANUAL_RE = _word_alternation(MANUAL_COMMANDS)
+DESTINATION_RE = _word_alternation(DESTINATIONS)
+NAV_KEYWORD_RE = _word_alternation(['go', 'take', 'bring', 'drive', 'navigate', 'head'])
+FAST_RE = _word_alternation(['quickly', 'quick', 'rapidly', 'hurry', 'rush', 'asap', 'faster', 'fast'])
+SLOW_RE = _word_alternation(['slowly', 'slow', 'careful', 'carefully', 'steady', 'safe', 'safer'])
+# Phrasings the local fast path must not turn into a navigate command
+NEGATION_RE = _word_alternation(["don't", 'dont', 'do not', 'not', 'never', 'no'])
+QUESTION_RE = re.compile(r'\?\s*$|^(what|where|when|why|how|who|which|is|are|does|do|did|can|could|would|should|will)\b')
+
+# Called for the same message by preprocessing and post-processing, and users repeat commands
+@lru_cache(maxsize=256)
 def detect_command_type(message):
     """Detect the type of command from user input"""
     lower_msg = message.lower().strip()
@@ -67,52 +154,39 @@ def detect_command_type(message):
     if is_fare_report_input(message):
         return "fare_report"
     
-    # Navigation keywords and destinations
-    nav_keywords = ['go', 'take', 'bring', 'drive', 'navigate', 'head']
-    destinations = ['home', 'office', 'airport', 'school', 'work', 'house']
-    
-    # Manual command keywords
-    manual_commands = {
-        'stop': 'stop',
-        'forward': 'go_forward',
-        'go forward': 'go_forward',
-        'move forward': 'go_forward',
-        'backward': 'go_backward',
-        'go backward': 'go_backward',
-        'reverse': 'go_backward',
-        'left': 'turn_left',
-        'turn left': 'turn_left',
-        'go left': 'turn_left',
-        'right': 'turn_right',
-        'turn right': 'turn_right',
-        'go right': 'turn_right',
-        'turn around': 'turn_around',
-        'u-turn': 'turn_around'
-    }
-    
-    # Check for manual commands
-    for cmd, action in manual_commands.items():
-        if cmd in lower_msg:
-            return "manual", action
-    
-    # Check for navigation
-    has_nav_keyword = any(keyword in lower_msg for keyword in nav_keywords)
-    has_destination = any(dest in lower_msg for dest in destinations)
-    
-    # Even without nav keyword, if there's a clear destination, treat as navigation
-    if has_destination:
-        return "navigate"
+    # Check for manual commands, if several match the earliest table entry wins
+    found = MANUAL_RE.findall(lower_msg)
+    if found:
+        return "manual", MANUAL_COMMANDS[min(found, key=MANUAL_PRIORITY.__getitem__)]
     
+    # Even without nav keyword, if there's a clear destination, treat as navigation.
     # If it has navigation keywords but no clear destination, still might be navigation
-    if has_nav_keyword:
+    if DESTINATION_RE.search(lower_msg) or NAV_KEYWORD_RE.search(lower_msg):
         return "navigate"
     
     return "chat"
 
-def preprocess_command(message):
-    """Preprocess command to help the model understand better"""
+@lru_cache(maxsize=256)
+def detect_navigation(message):
+    """Detect (destination or None, speed) for a navigation command"""
     lower_msg = message.lower()
     
+    # Detect speed
+    if FAST_RE.search(lower_msg):
+        speed = "fast"
+    elif SLOW_RE.search(lower_msg):
+        speed = "slow"
+    else:
+        speed = "normal"
+    
+    # Detect destination
+    dest_match = DESTINATION_RE.search(lower_msg)
+    destination = DESTINATIONS[dest_match.group(1)] if dest_match else None
+    return destination, speed
+
+@lru_cache(maxsize=256)
+def preprocess_command(message):
+    """Preprocess command to help the model understand better"""
     # Detect command type
     cmd_type = detect_command_type(message)
     
@@ -123,45 +197,52 @@ def preprocess_command(message):
     elif isinstance(cmd_type, tuple) and cmd_type[0] == "manual":
         return message + f" (Type: MANUAL, Action: {cmd_type[1]})"
     
-    # For navigation commands, detect speed
-    fast_words = ['quickly', 'quick', 'rapidly', 'hurry', 'rush', 'asap', 'faster', 'fast']
-    slow_words = ['slowly', 'slow', 'careful', 'carefully', 'steady', 'safe', 'safer']
-    
-    speed = "normal"
-    for word in fast_words:
-        if word in lower_msg:
-            speed = "fast"
-            break
+    # For navigation commands, detect destination and speed
+    destination, speed = detect_navigation(message)
+    hints = f" (Type: NAVIGATE, Destination: {destination or 'unknown'}, Speed: {speed})"
+    return message + hints
+
+def build_local_reply(message):
+    """Answer unambiguous manual/navigation commands without the LLM, None otherwise"""
+    cmd_type = detect_command_type(message)
     
-    if speed == "normal":
-        for word in slow_words:
-            if word in lower_msg:
-                speed = "slow"
-                break
+    if isinstance(cmd_type, tuple) and cmd_type[0] == "manual":
+        action = cmd_type[1]
+        command = {"task_type": "manual_command", "action": action,
+                   "parameters": {"destination": None, "speed": None}}
+        return f"{MANUAL_REPLIES[action]}\nJSON: {json.dumps(command)}"
     
-    # Detect destination
-    destination_map = {
-        'home': 'home',
-        'house': 'home',
-        'office': 'office',
-        'work': 'office',
-        'school': 'school',
-        'airport': 'airport'
-    }
-    
-    destination = None
-    for dest_var, dest_standard in destination_map.items():
-        if dest_var in lower_msg:
-            destination = dest_standard
-            break
+    if cmd_type == "navigate":
+        lower_msg = message.lower().strip()
+        # A destination word alone ("does this work?") is not a request to drive there
+        if not NAV_KEYWORD_RE.search(lower_msg) or NEGATION_RE.search(lower_msg) or QUESTION_RE.search(lower_msg):
+            return None
+        destination, speed = detect_navigation(message)
+        if destination is None:
+            return None  # Ambiguous, let the model ask where to go
+        place = "home" if destination == "home" else f"to the {destination}"
+        command = {"task_type": "navigate", "action": "navigate_to",
+                   "parameters": {"destination": destination, "speed": speed}}
+        return f"Taking you {place} at {speed} speed.\nJSON: {json.dumps(command)}"
     
-    hints = f" (Type: NAVIGATE, Destination: {destination or 'unknown'}, Speed: {speed})"
-    return message + hints
+    return None
+
+def show_parsed_command(parsed_json):
+    """Print the fields of a parsed command"""
+    print("\n📊 Parsed Command:")
+    print(f"   Task Type: {parsed_json.get('task_type', 'unknown')}")
+    print(f"   Action: {parsed_json.get('action', 'unknown')}")
+    if 'parameters' in parsed_json:
+        params = parsed_json['parameters']
+        if params.get('destination'):
+            print(f"   Destination: {params['destination']}")
+        if params.get('speed') is not None:
+            print(f"   Speed: {params['speed']}")
 
 def extract_json_from_response(response):
     """Extract JSON from the model's response"""
     # Look for JSON line
-    json_match = re.search(r'JSON:\s*({.*})', response, re.IGNORECASE)
+    json_match = JSON_LINE_RE.search(response)
     if json_match:
         try:
             return json.loads(json_match.group(1))
@@ -190,70 +271,117 @@ def post_process_response(response, message):
     
     return response, parsed_json
 
-def chat_with_driving_assistant(message, url="http://localhost:11434/api/generate", model="smollm2"):
+def print_worker(out_q, max_bytes=64, max_delay=0.05):
+    """Write streamed text to stdout until a None arrives, batching tokens
+    so there is one write+flush per ~64 chars or 50 ms instead of one per token"""
+    parts = []
+    size = 0
+    last_flush = time.monotonic()
+    while True:
+        try:
+            text = out_q.get(timeout=max_delay)
+        except queue.Empty:
+            text = ''  # Nothing new, but what's buffered may now be due
+        if text is None:
+            break
+        parts.append(text)
+        size += len(text)
+        now = time.monotonic()
+        if size and (size >= max_bytes or now - last_flush >= max_delay):
+            sys.stdout.write(''.join(parts))
+            sys.stdout.flush()
+            parts.clear()
+            size = 0
+            last_flush = now
+    sys.stdout.write(''.join(parts))
+    sys.stdout.flush()
+
+def chat_with_driving_assistant(message, url="http://localhost:11434/api/chat", model="smollm2"):
     """Send message to Ollama with system prompt and stream response"""
     
+    # Deterministic commands are answered locally, skipping the HTTP + LLM round-trip
+    local_reply = build_local_reply(message)
+    if local_reply is not None:
+        print(f"🤖 Driving Assistant: {local_reply}")
+        show_parsed_command(extract_json_from_response(local_reply))
+        return local_reply
+    
     # Preprocess the message
     processed_message = preprocess_command(message)
     
-    # System prompt and user message combination
-    full_prompt = f"{SYSTEM_PROMPT}\n\nUser: {processed_message}\nAssistant:"
-
+    # Command replies are a line plus at most one JSON line, chat can run longer
+    cmd_type = detect_command_type(message)
+    is_command = cmd_type in ("navigate", "fare_report") or isinstance(cmd_type, tuple)
+    
+    # The system prompt goes in its own message and never changes, so Ollama keeps
+    # its KV cache between turns and only the user message is prefilled
     payload = {
         "model": model,
-        "prompt": full_prompt,
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": processed_message}
+        ],
         "stream": True,
+        "keep_alive": "10m",
         "options": {
             "temperature": 0.1,
             "top_p": 0.8,
             "repeat_penalty": 1.1,
-            "num_predict": 150
+            # A command reply is one sentence plus the JSON line, ~50-60 tokens; the stop strings end it sooner
+            "num_predict": 80 if is_command else 150,
+            # A blank line may come before the JSON line, so only chat turns stop on one
+            "stop": ["\nUser:"] if is_command else ["\nUser:", "\n\n"]
         }
     }
 
     try:
-        response = requests.post(url, json=payload, stream=True)
+        response = SESSION.post(url, json=payload, stream=True)
         response.raise_for_status()
 
         print("🤖 Driving Assistant: ", end='', flush=True)
-        full_response = ""
-        buffer = ""
-
-        for line in response.iter_lines():
-            if line:
-                data = json.loads(line)
-                if 'response' in data:
-                    chunk = data['response']
-                    buffer += chunk
-                    
-                    # Clean display: remove hints but preserve spaces
-                    clean_chunk = re.sub(r'\s*\(Type:.*?\)\s*', ' ', chunk)
-                    # Also clean any double spaces
-                    clean_chunk = re.sub(r'\s+', ' ', clean_chunk)
-                    
-                    # Print cleaned chunk
-                    print(clean_chunk, end='', flush=True)
-                    full_response += chunk
-                    
-                if data.get('done', False):
+        response_parts = []
+
+        # Terminal writes happen on their own thread so they never hold up the socket read
+        out_q = queue.Queue()
+        printer = threading.Thread(target=print_worker, args=(out_q,), daemon=True)
+        printer.start()
+        try:
+            # NDJSON stream: split on newlines ourselves and keep any partial line for the next read
+            pending = b''
+            done = False
+            for data_bytes in response.iter_content(chunk_size=4096):
+                pending += data_bytes
+                *lines, pending = pending.split(b'\n')
+                for line in lines:
+                    if not line:
+                        continue
+                    data = json_loads(line)
+                    if 'message' in data:
+                        chunk = data['message']['content']
+                        # Print as it arrives, hint cleanup happens once on the full reply
+                        out_q.put(chunk)
+                        response_parts.append(chunk)
+                        
+                    if data.get('done', False):
+                        done = True
+                        break
+                if done:
                     break
+        finally:
+            out_q.put(None)
+            printer.join()
 
         print()  # New line
         
+        # Drop any "(Type: ...)" hint the model echoed back from the preprocessed message
+        full_response = TYPE_HINT_RE.sub(' ', ''.join(response_parts)).strip()
+        
         # Post-process to fix any JSON issues
         full_response, parsed_json = post_process_response(full_response, message)
         
         # Display parsed JSON if available
         if parsed_json and not is_fare_report_input(message):
-            print("\n📊 Parsed Command:")
-            print(f"   Task Type: {parsed_json.get('task_type', 'unknown')}")
-            print(f"   Action: {parsed_json.get('action', 'unknown')}")
-            if 'parameters' in parsed_json:
-                params = parsed_json['parameters']
-                if params.get('destination'):
-                    print(f"   Destination: {params['destination']}")
-                if params.get('speed') is not None:
-                    print(f"   Speed: {params['speed']}")
+            show_parsed_command(parsed_json)
         
         return full_response
 
@@ -264,16 +392,21 @@ def chat_with_driving_assistant(message, url="http://localhost:11434/api/generat
         print(f"❌ Error: {e}")
         return None
 
+@lru_cache(maxsize=256)
 def is_fare_report_input(message):
     """Check if the input is a fare report JSON"""
+    text = message.strip()
+    # Cheap shape check first so ordinary chat never raises a parse error
+    if not (text.startswith('{') and text.endswith('}')):
+        return False
     try:
-        data = json.loads(message.strip())
-        required_keys = {'duration', 'fare', 'distance'}
-        return (isinstance(data, dict) and
-                required_keys.issubset(set(data.keys())) and
-                all(isinstance(data[key], (int, float)) for key in required_keys))
-    except:
+        data = json_loads(text)
+    except ValueError:
         return False
+    required_keys = {'duration', 'fare', 'distance'}
+    return (isinstance(data, dict) and
+            required_keys.issubset(data) and
+            all(isinstance(data[key], (int, float)) for key in required_keys))
 
 def show_examples():
     """Show example commands"""
@@ -293,6 +426,13 @@ def show_examples():
     print("    • '{\"duration\": 23, \"fare\": 18.5, \"distance\": 12.4}'")
     print("\n  💬 Other inputs will be treated as chat")
 
+def warm_up_model(url="http://localhost:11434/api/generate", model="smollm2"):
+    """Load the model into Ollama now so the first command is not a cold start"""
+    try:
+        SESSION.post(url, json={"model": model, "prompt": "", "keep_alive": "10m"}, timeout=30)
+    except requests.exceptions.RequestException:
+        pass  # chat_with_driving_assistant reports connection problems
+
 def main():
     print("🚗 Robust Robotic Driving Assistant (Ctrl+C to exit)")
     print("=" * 50)
@@ -302,6 +442,7 @@ def main():
     print("  • Fare report: '{\"duration\": 23, \"fare\": 18.5, \"distance\": 12.4}'")
     print("  • Type 'help' to see more examples")
     print("-" * 50)
+    threading.Thread(target=warm_up_model, daemon=True).start()
 
     try:
         while True:
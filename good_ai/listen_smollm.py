@@ -14,6 +14,15 @@ CHANNELS = 1
 OUTPUT_FILE = "recorded_audio.wav"
 recording = []
 
+# Global Whisper model
+whisper_model = None
+
+def init_whisper_model():
+    """Load Whisper model once"""
+    global whisper_model
+    if whisper_model is None:
+        whisper_model = whisper.load_model("base")
+
 def audio_callback(indata, frames, time_info, status):
     recording.append(indata.copy())
 
@@ -23,14 +32,21 @@ def record_audio():
     print("🎙️  Recording... (Press Enter to stop)")
     with sd.InputStream(samplerate=SAMPLE_RATE, channels=CHANNELS, callback=audio_callback):
         input()
-    audio_data = np.concatenate(recording, axis=0)
+    # Size the output once from the captured blocks and copy each block into place
+    total = sum(len(block) for block in recording)
+    audio_data = np.empty((total, CHANNELS), dtype=np.float32)
+    pos = 0
+    for block in recording:
+        audio_data[pos:pos + len(block)] = block
+        pos += len(block)
+    recording.clear()
     wav.write(OUTPUT_FILE, SAMPLE_RATE, audio_data)
     print(f"✅ Audio saved: {OUTPUT_FILE}")
 
 def transcribe_audio():
     print("📝 Transcribing audio...")
-    model = whisper.load_model("base")
-    result = model.transcribe(OUTPUT_FILE, fp16=False)
+    init_whisper_model()
+    result = whisper_model.transcribe(OUTPUT_FILE, fp16=False)
     text = result["text"].strip()
     print(f"💬 You (voice): {text}")
     return text
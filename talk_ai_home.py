@@ -2,62 +2,120 @@
 """Voice+Text Chatbot with Whisper & Ollama(smollm2) + TTS, using ai_prompt.txt for the system prompt"""
 
 import sys
+import re
+import queue
+import threading
 import sounddevice as sd
-import scipy.io.wavfile as wav
 import numpy as np
-import whisper
+from faster_whisper import WhisperModel  # pip install faster-whisper
 import ollama  # pip install ollama
 import pyttsx3  # pip install pyttsx3
-import os
+from functools import lru_cache
+from pathlib import Path
 
 # Configuration
 SAMPLE_RATE = 16000
 CHANNELS = 1
-OUTPUT_FILE = "recorded_audio.wav"
-recording = []
+MAX_RECORD_SECONDS = 60
 
+# One preallocated capture buffer, reused for every recording
+audio_buf = np.empty(SAMPLE_RATE * MAX_RECORD_SECONDS, dtype=np.float32)
+audio_pos = 0
+
+# Global Whisper model
+whisper_model = None
+
+def init_whisper_model():
+    """Load Whisper model once"""
+    global whisper_model
+    if whisper_model is None:
+        # CTranslate2 backend with int8 weights
+        whisper_model = WhisperModel("base", device="auto", compute_type="int8")
+
+@lru_cache(maxsize=1)
 def load_system_prompt(filename="ai_prompt.txt"):
-    """Load the system prompt from a text file."""
-    if not os.path.exists(filename):
+    """Load the system prompt from a text file (read once, then cached)."""
+    try:
+        return Path(filename).read_text(encoding="utf-8")
+    except FileNotFoundError:
         print(f"❌ System prompt file '{filename}' not found.")
         sys.exit(1)
-    with open(filename, "r", encoding="utf-8") as f:
-        return f.read()
 
 SYSTEM_PROMPT = load_system_prompt()
 
 def audio_callback(indata, frames, time_info, status):
-    recording.append(indata.copy())
+    # Copy straight into the capture buffer (anything past MAX_RECORD_SECONDS is dropped)
+    global audio_pos
+    n = min(len(indata), len(audio_buf) - audio_pos)
+    audio_buf[audio_pos:audio_pos + n] = indata[:n, 0]
+    audio_pos += n
 
 def record_audio():
-    global recording
-    recording = []
+    """Record until Enter is pressed and return the mono float32 samples"""
+    global audio_pos
+    audio_pos = 0
     print("🎙️  Recording... (Press Enter to stop)")
     with sd.InputStream(samplerate=SAMPLE_RATE, channels=CHANNELS, callback=audio_callback):
         input()
-    audio_data = np.concatenate(recording, axis=0)
-    wav.write(OUTPUT_FILE, SAMPLE_RATE, audio_data)
-    print(f"✅ Audio saved: {OUTPUT_FILE}")
+    # Whisper takes the samples directly, no WAV round-trip through disk
+    audio_data = audio_buf[:audio_pos]
+    print("✅ Audio captured")
+    return audio_data
 
-def transcribe_audio():
+def transcribe_audio(audio_data):
     print("📝 Transcribing audio...")
-    model = whisper.load_model("base")
-    result = model.transcribe(OUTPUT_FILE, fp16=False)
-    text = result["text"].strip()
+    init_whisper_model()
+    segments, _ = whisper_model.transcribe(audio_data, beam_size=1, vad_filter=True)
+    text = "".join(segment.text for segment in segments).strip()
     print(f"💬 You (voice): {text}")
     return text
 
+# Sentences are spoken by one worker, in order, while the reply is still generating
+SENTENCE_END_RE = re.compile(r"[.!?]+\s|\n")
+tts_queue = queue.Queue()
+
+def queue_sentences(text):
+    """Queue every finished sentence in text for speech and return the unfinished rest"""
+    start = 0
+    for match in SENTENCE_END_RE.finditer(text):
+        sentence = text[start:match.end()].strip()
+        if sentence:
+            tts_queue.put(sentence)
+        start = match.end()
+    return text[start:]
+
+def tts_worker():
+    """Speak queued sentences one at a time"""
+    while True:
+        sentence = tts_queue.get()
+        try:
+            speak(sentence)
+        except Exception as e:
+            # Keep the worker alive, or the next tts_queue.join() would never return
+            print(f"🔇 TTS Error: {e}")
+        finally:
+            tts_queue.task_done()
+
+# Global TTS engine
+tts_engine = None
+
+def init_tts_engine():
+    """Initialize TTS engine once"""
+    global tts_engine
+    if tts_engine is None:
+        tts_engine = pyttsx3.init()
+        tts_engine.setProperty('rate', 150)
+        tts_engine.setProperty('volume', 0.9)
+
 def speak(text):
     """Convert text to speech using pyttsx3"""
-    engine = pyttsx3.init()
-    engine.setProperty('rate', 150)
-    engine.setProperty('volume', 0.9)
-    engine.say(text)
-    engine.runAndWait()
+    init_tts_engine()
+    tts_engine.say(text)
+    tts_engine.runAndWait()
 
 def chat_with_ollama(message, model="smollm2"):
     print("🤖 AI: ", end='', flush=True)
-    full_response = []
+    pending = ""
     # Use system prompt from file
     stream = ollama.chat(
         model=model,
@@ -66,23 +124,36 @@ def chat_with_ollama(message, model="smollm2"):
             {'role': 'user', 'content': message}
         ],
         stream=True,
+        keep_alive='10m',  # keep the model loaded between turns
     )
     for chunk in stream:
         content = chunk['message']['content']
         print(content, end='', flush=True)
-        full_response.append(content)
+        # Hand finished sentences to the TTS worker so speech starts before generation ends
+        pending = queue_sentences(pending + content)
     print()  # New line after streaming
-    speak(''.join(full_response))
+    if pending.strip():
+        tts_queue.put(pending.strip())
+    tts_queue.join()
+
+def warm_up_model(model="smollm2"):
+    """Load the model into Ollama now so the first reply is not a cold start"""
+    try:
+        ollama.generate(model=model, prompt="", keep_alive="10m")
+    except Exception as e:
+        print(f"⚠️  Ollama warm-up failed: {e}")
 
 def main():
     print("🤖 Voice+Text smollm2 Chatbot (Ctrl+C to exit)")
     print("-" * 40)
+    threading.Thread(target=tts_worker, daemon=True).start()
+    threading.Thread(target=warm_up_model, daemon=True).start()
     try:
         while True:
             mode = input("\n[1] Voice input  [2] Text input  [q] Quit > ").strip().lower()
             if mode == '1':
-                record_audio()
-                message = transcribe_audio()
+                audio_data = record_audio()
+                message = transcribe_audio(audio_data)
                 if message:
                     chat_with_ollama(message)
             elif mode == '2':
@@ -2,46 +2,92 @@
 """Voice+Text Chatbot with Whisper & Ollama(smollm2) + TTS with Enter Key Interrupt"""
 import sys
 import threading
-import time
 import select
+import re
+import queue
 import sounddevice as sd
-import scipy.io.wavfile as wav
 import numpy as np
-import whisper
+from faster_whisper import WhisperModel  # pip install faster-whisper
 import ollama  # pip install ollama
 import pyttsx3  # pip install pyttsx3
 
 # Configuration
 SAMPLE_RATE = 16000
 CHANNELS = 1
-OUTPUT_FILE = "recorded_audio.wav"
-recording = []
+MAX_RECORD_SECONDS = 60
+
+# One preallocated capture buffer, reused for every recording
+audio_buf = np.empty(SAMPLE_RATE * MAX_RECORD_SECONDS, dtype=np.float32)
+audio_pos = 0
+
+# Global Whisper model
+whisper_model = None
+
+def init_whisper_model():
+    """Load Whisper model once"""
+    global whisper_model
+    if whisper_model is None:
+        # CTranslate2 backend with int8 weights
+        whisper_model = WhisperModel("base", device="auto", compute_type="int8")
 
 # Global variables for interrupt control
 stop_speaking = False
 tts_engine = None
 
 def audio_callback(indata, frames, time_info, status):
-    recording.append(indata.copy())
+    # Copy straight into the capture buffer (anything past MAX_RECORD_SECONDS is dropped)
+    global audio_pos
+    n = min(len(indata), len(audio_buf) - audio_pos)
+    audio_buf[audio_pos:audio_pos + n] = indata[:n, 0]
+    audio_pos += n
 
 def record_audio():
-    global recording
-    recording = []
+    """Record until Enter is pressed and return the mono float32 samples"""
+    global audio_pos
+    audio_pos = 0
     print("🎙️  Recording... (Press Enter to stop)")
     with sd.InputStream(samplerate=SAMPLE_RATE, channels=CHANNELS, callback=audio_callback):
         input()
-    audio_data = np.concatenate(recording, axis=0)
-    wav.write(OUTPUT_FILE, SAMPLE_RATE, audio_data)
-    print(f"✅ Audio saved: {OUTPUT_FILE}")
+    # Whisper takes the samples directly, no WAV round-trip through disk
+    audio_data = audio_buf[:audio_pos]
+    print("✅ Audio captured")
+    return audio_data
 
-def transcribe_audio():
+def transcribe_audio(audio_data):
     print("📝 Transcribing audio...")
-    model = whisper.load_model("base")
-    result = model.transcribe(OUTPUT_FILE, fp16=False)
-    text = result["text"].strip()
+    init_whisper_model()
+    segments, _ = whisper_model.transcribe(audio_data, beam_size=1, vad_filter=True)
+    text = "".join(segment.text for segment in segments).strip()
     print(f"💬 You (voice): {text}")
     return text
 
+# Sentences are spoken by one worker, in order, while the reply is still generating
+SENTENCE_END_RE = re.compile(r"[.!?]+\s|\n")
+tts_queue = queue.Queue()
+
+def queue_sentences(text):
+    """Queue every finished sentence in text for speech and return the unfinished rest"""
+    start = 0
+    for match in SENTENCE_END_RE.finditer(text):
+        sentence = text[start:match.end()].strip()
+        if sentence:
+            tts_queue.put(sentence)
+        start = match.end()
+    return text[start:]
+
+def tts_worker():
+    """Speak queued sentences one at a time, skipping the rest after an interrupt"""
+    while True:
+        sentence = tts_queue.get()
+        try:
+            if not stop_speaking:
+                speak_with_interrupt(sentence)
+        except Exception as e:
+            # Keep the worker alive, or the next tts_queue.join() would never return
+            print(f"🔇 TTS Error: {e}")
+        finally:
+            tts_queue.task_done()
+
 def init_tts_engine():
     """Initialize TTS engine once"""
     global tts_engine
@@ -49,87 +95,84 @@ def init_tts_engine():
         tts_engine = pyttsx3.init()
         tts_engine.setProperty('rate', 150)
         tts_engine.setProperty('volume', 0.9)
+        tts_engine.connect('started-word', on_word)
 
-def input_listener():
-    """Listen for Enter key press to interrupt speech"""
+def on_word(name, location, length):
+    """Cut speech off at the next word once Enter has been pressed"""
     global stop_speaking
-    try:
-        input()  # Wait for Enter key
+    # Non-blocking peek at stdin, no listener thread left behind to eat the next prompt
+    if not stop_speaking and select.select([sys.stdin], [], [], 0)[0]:
+        sys.stdin.readline()
         stop_speaking = True
         print("\n⏹️  Speech interrupted!")
-    except:
-        pass
+    if stop_speaking:
+        tts_engine.stop()
+
+def arm_interrupt():
+    """Arm the Enter key interrupt for the next reply"""
+    global stop_speaking
+    stop_speaking = False
+    print("💡 Press ENTER to interrupt speech")
 
 def speak_with_interrupt(text):
     """Convert text to speech with Enter key interrupt capability"""
-    global stop_speaking, tts_engine
-    
     init_tts_engine()
-    stop_speaking = False
     
-    print("💡 Press ENTER to interrupt speech")
-    
-    # Start input listener in a separate thread
-    listener_thread = threading.Thread(target=input_listener, daemon=True)
-    listener_thread.start()
-    
-    # Split text into smaller chunks for more responsive interruption
-    words = text.split()
-    chunk_size = 10  # Speak 10 words at a time
-    
-    for i in range(0, len(words), chunk_size):
-        if stop_speaking:
-            break
-        
-        chunk = ' '.join(words[i:i+chunk_size])
-        tts_engine.say(chunk)
-        tts_engine.runAndWait()
-        
-        # Small delay to check for interruption
-        time.sleep(0.1)
-    
-    if stop_speaking:
-        tts_engine.stop()
+    # One pass per sentence, on_word stops it within a word of an interrupt
+    tts_engine.say(text)
+    tts_engine.runAndWait()
 
 def chat_with_ollama(message, model="smollm2"):
     # def chat_with_ollama(message, model="phi4-mini"):
+    arm_interrupt()
     print("🤖 AI: ", end='', flush=True)
-    full_response = []
+    pending = ""
     
     try:
         stream = ollama.chat(
             model=model,
             messages=[{'role': 'user', 'content': message}],
             stream=True,
+            keep_alive='10m',  # keep the model loaded between turns
         )
         
         for chunk in stream:
             content = chunk['message']['content']
             print(content, end='', flush=True)
-            full_response.append(content)
+            # Hand finished sentences to the TTS worker so speech starts before generation ends
+            pending = queue_sentences(pending + content)
         
         print()  # New line after streaming
-        
-        # Speak the full response with interrupt capability
-        response_text = ''.join(full_response)
-        if response_text.strip():
-            speak_with_interrupt(response_text)
+        if pending.strip():
+            tts_queue.put(pending.strip())
             
     except Exception as e:
         print(f"\n❌ Error with Ollama: {e}")
+    
+    # Wait until the reply has been spoken (or interrupted)
+    tts_queue.join()
+
+def warm_up_model(model="smollm2"):
+    """Load the model into Ollama now so the first reply is not a cold start"""
+    try:
+        ollama.generate(model=model, prompt="", keep_alive="10m")
+    except Exception as e:
+        print(f"⚠️  Ollama warm-up failed: {e}")
 
 def main():
     print("🤖 Voice+Text smollm2 Chatbot (Ctrl+C to exit)")
     print("💡 Press ENTER during AI speech to interrupt")
     print("-" * 50)
+    threading.Thread(target=tts_worker, daemon=True).start()
+    threading.Thread(target=warm_up_model, daemon=True).start()
     
     try:
         while True:
             mode = input("\n[1] Voice input  [2] Text input  [q] Quit > ").strip().lower()
             
             if mode == '1':
-                record_audio()
-                message = transcribe_audio()
+                audio_data = record_audio()
+                message = transcribe_audio(audio_data)
                 if message:
                     chat_with_ollama(message)
                     
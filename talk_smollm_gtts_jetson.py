@@ -1,116 +1,171 @@
 #!/usr/bin/env python3
-"""Voice+Text Chatbot with Whisper, Ollama & Google TTS"""
+"""Voice+Text Chatbot with Whisper, Ollama & Piper TTS"""
 
-import os, sys, warnings, tempfile, time
+import warnings, re, queue, threading
 import numpy as np
 import sounddevice as sd
-import scipy.io.wavfile as wav
-import whisper, ollama
-from gtts import gTTS
+import ollama
+import ctranslate2
+from faster_whisper import WhisperModel  # pip install faster-whisper
+from piper import PiperVoice  # pip install piper-tts
 
-# Suppress warnings and pygame messages
+# Suppress warnings
 warnings.filterwarnings("ignore")
-os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
-old_stdout = sys.stdout
-sys.stdout = open(os.devnull, 'w')
-import pygame
-sys.stdout.close()
-sys.stdout = old_stdout
-pygame.mixer.init()
+
+# Local Piper voice model (ONNX), synthesized on-device with no network round-trip
+PIPER_VOICE = "en_US-lessac-medium.onnx"
+
+# End of a sentence in the streamed reply
+SENTENCE_END_RE = re.compile(r"[.!?]+\s|\n")
 
 class VoiceChatbot:
     def __init__(self):
         self.sample_rate = 16000
         self.channels = 1
-        self.audio_file = "recorded_audio.wav"
-        self.recording = []
+        
+        # One preallocated capture buffer, reused for every recording
+        self.max_record_seconds = 60
+        self._audio_buf = np.empty(self.sample_rate * self.max_record_seconds, dtype=np.float32)
+        self._audio_pos = 0
+        
+        # Whisper model is loaded on first use and reused afterwards
+        self.whisper_model = None
+        
+        # Piper voice is loaded once and reused for every sentence (None = text only)
+        try:
+            self.tts_voice = PiperVoice.load(PIPER_VOICE)
+        except Exception as e:
+            print(f"⚠️  Piper voice failed to load ({e}), replies will be text only")
+            print(f"   Download it with: python3 -m piper.download_voices {PIPER_VOICE.removesuffix('.onnx')}")
+            self.tts_voice = None
+        
+        # Sentences are spoken by one worker, in order, while the reply is still generating
+        self._tts_q = queue.Queue()
+        threading.Thread(target=self._tts_worker, daemon=True).start()
         
     def record_audio(self):
-        """Record audio until Enter is pressed"""
-        self.recording = []
+        """Record audio until Enter is pressed and return the mono float32 samples"""
+        self._audio_pos = 0
         print("🎙️  Recording... (Press Enter to stop)")
         
         def callback(indata, frames, time_info, status):
-            self.recording.append(indata.copy())
+            # Copy straight into the capture buffer (anything past max_record_seconds is dropped)
+            pos = self._audio_pos
+            n = min(len(indata), len(self._audio_buf) - pos)
+            self._audio_buf[pos:pos + n] = indata[:n, 0]
+            self._audio_pos = pos + n
             
         with sd.InputStream(samplerate=self.sample_rate, channels=self.channels, callback=callback):
             input()
             
-        audio_data = np.concatenate(self.recording, axis=0)
-        wav.write(self.audio_file, self.sample_rate, audio_data)
-        print(f"✅ Audio saved")
+        # Whisper takes the samples directly, no WAV round-trip through disk
+        audio_data = self._audio_buf[:self._audio_pos]
+        print(f"✅ Audio captured")
+        return audio_data
         
-    def transcribe_audio(self):
+    def get_whisper_model(self):
+        """Load the Whisper model on first use"""
+        if self.whisper_model is None:
+            # CTranslate2 backend: int8 weights, FP16 activations on the Jetson GPU
+            if ctranslate2.get_cuda_device_count() > 0:
+                self.whisper_model = WhisperModel("base", device="cuda", compute_type="int8_float16")
+            else:
+                self.whisper_model = WhisperModel("base", device="cpu", compute_type="int8")
+        return self.whisper_model
+        
+    def transcribe_audio(self, audio_data):
         """Transcribe recorded audio to text"""
         print("📝 Transcribing...")
-        model = whisper.load_model("base")
-        result = model.transcribe(self.audio_file, fp16=False)
-        text = result["text"].strip()
+        segments, _ = self.get_whisper_model().transcribe(audio_data, beam_size=1, vad_filter=True)
+        text = "".join(segment.text for segment in segments).strip()
         print(f"💬 You: {text}")
         return text
         
     def speak(self, text):
-        """Convert text to speech using Google TTS"""
-        if not text.strip():
+        """Convert text to speech locally with Piper"""
+        if self.tts_voice is None or not text.strip():
             return
             
         try:
-            tts = gTTS(text=text, lang='en')
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp:
-                temp_file = tmp.name
-                
-            tts.save(temp_file)
-            pygame.mixer.music.load(temp_file)
-            pygame.mixer.music.play()
-            
-            while pygame.mixer.music.get_busy():
-                time.sleep(0.1)
-                
-            os.unlink(temp_file)
+            # Raw 16-bit PCM straight to the sound card, no MP3 or temp file
+            # piper-tts >= 1.3 yields one AudioChunk per sentence
+            for chunk in self.tts_voice.synthesize(text):
+                sd.play(np.frombuffer(chunk.audio_int16_bytes, dtype=np.int16), chunk.sample_rate)
+                sd.wait()
         except Exception as e:
             print(f"🔇 TTS Error: {e}")
             
+    def _tts_worker(self):
+        """Speak queued sentences one at a time"""
+        while True:
+            sentence = self._tts_q.get()
+            try:
+                self.speak(sentence)
+            finally:
+                self._tts_q.task_done()
+                
+    def queue_sentences(self, text):
+        """Queue every finished sentence in text for speech and return the unfinished rest"""
+        start = 0
+        for match in SENTENCE_END_RE.finditer(text):
+            sentence = text[start:match.end()].strip()
+            if sentence:
+                self._tts_q.put(sentence)
+            start = match.end()
+        return text[start:]
+        
     def chat_with_ai(self, message):
         """Send message to AI and get response"""
         print("🤖 AI: ", end='', flush=True)
-        response_parts = []
+        pending = ""
         
         try:
             stream = ollama.chat(
                 model="smollm2",
                 messages=[{'role': 'user', 'content': message}],
-                stream=True
+                stream=True,
+                keep_alive='10m'  # keep the model loaded between turns
             )
             
             for chunk in stream:
                 content = chunk['message']['content']
                 print(content, end='', flush=True)
-                response_parts.append(content)
+                # Hand finished sentences to the TTS worker so speech starts before generation ends
+                pending = self.queue_sentences(pending + content)
                 
             print()  # New line
-            
-            response = ''.join(response_parts)
-            if response.strip():
-                self.speak(response)
+            if pending.strip():
+                self._tts_q.put(pending.strip())
                 
         except Exception as e:
             error_msg = f"Error: {e}"
             print(error_msg)
-            self.speak("Sorry, I encountered an error.")
+            self._tts_q.put("Sorry, I encountered an error.")
+            
+        # Return once everything queued has been spoken
+        self._tts_q.join()
+            
+    def warm_up_model(self):
+        """Load the model into Ollama now so the first reply is not a cold start"""
+        try:
+            ollama.generate(model="smollm2", prompt="", keep_alive="10m")
+        except Exception as e:
+            print(f"⚠️  Ollama warm-up failed: {e}")
             
     def run(self):
         """Main chatbot loop"""
         print("🤖 Voice+Text Chatbot (Ctrl+C to exit)")
-        print("📋 Ollama + smollm2 required | 🌐 Internet for TTS")
+        print(f"📋 Ollama + smollm2 required | 🔊 Piper voice: {PIPER_VOICE}")
         print("-" * 50)
+        threading.Thread(target=self.warm_up_model, daemon=True).start()
         
         try:
             while True:
                 choice = input("\n[1] Voice [2] Text [q] Quit > ").strip().lower()
                 
                 if choice == '1':
-                    self.record_audio()
-                    message = self.transcribe_audio()
+                    audio_data = self.record_audio()
+                    message = self.transcribe_audio(audio_data)
                     if message:
                         self.chat_with_ai(message)
                         
@@ -127,7 +182,6 @@ class VoiceChatbot:
         except KeyboardInterrupt:
             pass
         finally:
-            pygame.mixer.quit()
             print("\n👋 Goodbye!")
 
 if __name__ == "__main__":
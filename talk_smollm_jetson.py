@@ -1,86 +1,250 @@
 #!/usr/bin/env python3
 """Voice+Text Chatbot with Whisper & Ollama(smollm2) + TTS"""
 import sys
+import re
+import queue
 import sounddevice as sd
-import scipy.io.wavfile as wav
 import numpy as np
-import whisper
+import ctranslate2
+from faster_whisper import WhisperModel  # pip install faster-whisper
 import ollama  # pip install ollama
-import pyttsx3  # pip install pyttsx3
 import warnings
 import os
+import platform
+import subprocess
+import threading
+import hashlib
+from collections import OrderedDict
+import time
 
 # Suppress future warnings from whisper/torch
 warnings.filterwarnings("ignore", category=FutureWarning, module="whisper")
 
-# Redirect stderr temporarily to suppress pyttsx3 errors
-class SuppressTTSErrors:
-    def __enter__(self):
-        self.old_stderr = sys.stderr
-        sys.stderr = open(os.devnull, 'w')
-        return self
-    
-    def __exit__(self, type, value, traceback):
-        sys.stderr.close()
-        sys.stderr = self.old_stderr
-
 # Configuration
 SAMPLE_RATE = 16000
 CHANNELS = 1
-OUTPUT_FILE = "recorded_audio.wav"
-recording = []
+MAX_RECORD_SECONDS = 60
 
-# Global TTS engine
-tts_engine = None
+# One preallocated capture buffer, reused for every recording
+audio_buf = np.empty(SAMPLE_RATE * MAX_RECORD_SECONDS, dtype=np.float32)
+audio_pos = 0
 
-def init_tts():
-    """Initialize TTS engine once"""
-    global tts_engine
-    if tts_engine is None:
-        try:
-            tts_engine = pyttsx3.init()
-            tts_engine.setProperty('rate', 150)
-            tts_engine.setProperty('volume', 0.9)
-            # Optionally, change voice:
-            # voices = tts_engine.getProperty('voices')
-            # if voices:
-            #     tts_engine.setProperty('voice', voices[0].id)
-        except Exception as e:
-            print(f"TTS initialization error: {e}")
-            tts_engine = False  # Mark as failed
+# Set USE_OPENAI_WHISPER=1 to fall back to the reference fp32 openai-whisper model
+USE_OPENAI_WHISPER = os.environ.get("USE_OPENAI_WHISPER") == "1"
+
+# Pass --cpu to keep Whisper and the LLM off the GPU on hosts without CUDA
+USE_GPU = "--cpu" not in sys.argv
+
+# Pass --compile to torch.compile the openai-whisper encoder (PyTorch 2.1+)
+COMPILE_WHISPER = "--compile" in sys.argv
+
+# Pass --debug-wav to also save each recording to disk for inspection
+DEBUG_WAV = "--debug-wav" in sys.argv
+DEBUG_WAV_FILE = "recorded_audio.wav"
+
+# 4-bit smollm2 build; fetch it once with: ollama pull smollm2:1.7b-instruct-q4_K_M
+LLM_MODEL = "smollm2:1.7b-instruct-q4_K_M"
+
+# Ollama keeps the model and its KV cache resident between turns.
+# FlashAttention and the KV cache type are server settings; start the server with
+#   OLLAMA_FLASH_ATTENTION=1 OLLAMA_KV_CACHE_TYPE=q8_0 ollama serve
+LLM_KEEP_ALIVE = "30m"
+LLM_OPTIONS = {
+    "num_ctx": 2048,
+    "num_gpu": -1 if USE_GPU else 0,  # -1 offloads every layer, 0 runs on the CPU
+    "num_thread": os.cpu_count(),
+}
+
+# One client for the whole session so every turn reuses the same pooled HTTP connection
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+ollama_client = ollama.Client(host=OLLAMA_HOST, timeout=600)
+
+# Conversation so far; resending the same prefix lets Ollama reuse its KV cache
+HISTORY = []
+MAX_HISTORY_MESSAGES = 20  # keep the prompt inside num_ctx
+
+# Streamed tokens are printed in batches of this many characters or this many seconds
+PRINT_BATCH_CHARS = 32
+PRINT_BATCH_SECONDS = 0.05
+
+# Single greedy pass in English: no language detection, no temperature fallback
+WHISPER_OPTIONS = {
+    "language": "en",
+    "task": "transcribe",
+    "temperature": 0.0,
+    "condition_on_previous_text": False,
+    "without_timestamps": True,
+}
+
+# Recent transcripts keyed by a hash of the samples, so a replayed clip skips Whisper
+TRANSCRIPT_CACHE_SIZE = 32
+transcript_cache = OrderedDict()
+
+# Global Whisper model, loaded in the background at startup
+whisper_model = None
+whisper_ready = threading.Event()
+
+# Piper voice (pip install piper-tts); --output-raw is 16-bit mono PCM at the voice's rate
+PIPER_VOICE = "en_US-lessac-medium.onnx"
+PIPER_SAMPLE_RATE = 22050
+PIPER_CHUNK = 4096
+
+# Fallback synthesizer for this OS, resolved once
+SYSTEM = platform.system()
+ESPEAK_SAMPLE_RATE = 22050
+ESPEAK_WAV_HEADER = 44
+
+# TTS process currently speaking, so cleanup() can stop it
+tts_process = None
+
+def init_whisper_model():
+    """Load Whisper model once"""
+    global whisper_model
+    if whisper_model is None:
+        if USE_OPENAI_WHISPER:
+            import whisper
+            model = whisper.load_model("base")
+            if COMPILE_WHISPER:
+                import torch
+                # The encoder always sees one fixed 30 s mel window, so it compiles once
+                model.encoder = torch.compile(model.encoder, mode="reduce-overhead")
+                # Pay the compile cost here rather than on the first voice turn
+                silence = whisper.log_mel_spectrogram(np.zeros(whisper.audio.N_SAMPLES, dtype=np.float32),
+                                                      n_mels=model.dims.n_mels)
+                whisper.decode(model, silence.to(model.device),
+                               whisper.DecodingOptions(language="en", without_timestamps=True, fp16=False))
+            whisper_model = model
+        elif USE_GPU and ctranslate2.get_cuda_device_count() > 0:
+            # CTranslate2 backend in FP16 on the Jetson GPU's tensor cores
+            whisper_model = WhisperModel("base", device="cuda", compute_type="float16")
+        else:
+            whisper_model = WhisperModel("base", device="cpu", compute_type="int8",
+                                         cpu_threads=os.cpu_count())
+
+def load_whisper_model():
+    """Load Whisper off the critical path so the first voice turn does not wait for it"""
+    try:
+        init_whisper_model()
+    except Exception as e:
+        print(f"⚠️  Whisper preload failed: {e}")
+    finally:
+        whisper_ready.set()
 
 def audio_callback(indata, frames, time_info, status):
-    recording.append(indata.copy())
+    # Copy straight into the capture buffer (anything past MAX_RECORD_SECONDS is dropped)
+    global audio_pos
+    n = min(len(indata), len(audio_buf) - audio_pos)
+    audio_buf[audio_pos:audio_pos + n] = indata[:n, 0]
+    audio_pos += n
 
 def record_audio():
-    global recording
-    recording = []
+    """Record until Enter is pressed and return the mono float32 samples"""
+    global audio_pos
+    audio_pos = 0
     print("🎙️  Recording... (Press Enter to stop)")
     with sd.InputStream(samplerate=SAMPLE_RATE, channels=CHANNELS, callback=audio_callback):
         input()
-    audio_data = np.concatenate(recording, axis=0)
-    wav.write(OUTPUT_FILE, SAMPLE_RATE, audio_data)
-    print(f"✅ Audio saved: {OUTPUT_FILE}")
+    # Whisper takes the samples directly, no WAV round-trip through disk
+    audio_data = audio_buf[:audio_pos]
+    print("✅ Audio captured")
+    if DEBUG_WAV:
+        import scipy.io.wavfile as wav
+        wav.write(DEBUG_WAV_FILE, SAMPLE_RATE, audio_data)
+        print(f"💾 Audio saved: {DEBUG_WAV_FILE}")
+    return audio_data
 
-def transcribe_audio():
+def transcribe_audio(audio_data):
     print("📝 Transcribing audio...")
-    model = whisper.load_model("base")
-    result = model.transcribe(OUTPUT_FILE, fp16=False)
-    text = result["text"].strip()
+    key = hashlib.blake2b(audio_data.tobytes(), digest_size=16).digest()
+    text = transcript_cache.get(key)
+    if text is None:
+        text = run_whisper(audio_data)
+        transcript_cache[key] = text
+        if len(transcript_cache) > TRANSCRIPT_CACHE_SIZE:
+            transcript_cache.popitem(last=False)
+    else:
+        transcript_cache.move_to_end(key)
     print(f"💬 You (voice): {text}")
     return text
 
+def run_whisper(audio_data):
+    """Transcribe the samples with whichever Whisper backend is loaded"""
+    whisper_ready.wait()
+    init_whisper_model()  # no-op once loaded, retries if the preload failed
+    if USE_OPENAI_WHISPER:
+        import whisper
+        if len(audio_data) <= whisper.audio.N_SAMPLES:
+            # One 30 s window: build the mel once and decode it directly, skipping transcribe()'s windowing
+            mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio_data),
+                                              n_mels=whisper_model.dims.n_mels)
+            options = whisper.DecodingOptions(language="en", task="transcribe", temperature=0.0,
+                                              without_timestamps=True, fp16=False)
+            text = whisper.decode(whisper_model, mel.to(whisper_model.device), options).text.strip()
+        else:
+            # openai-whisper is greedy when beam_size is unset and rejects best_of at temperature 0
+            text = whisper_model.transcribe(audio_data, fp16=False, **WHISPER_OPTIONS)["text"].strip()
+    else:
+        # vad_filter runs Silero VAD first so silence never reaches the encoder
+        segments, _ = whisper_model.transcribe(audio_data, beam_size=1, best_of=1,
+                                               vad_filter=True, **WHISPER_OPTIONS)
+        text = "".join(segment.text for segment in segments).strip()
+    return text
+
+# Sentences are spoken by one worker, in order, while the reply is still generating
+SENTENCE_END_RE = re.compile(r"[.!?]+\s|\n")
+tts_queue = queue.Queue()
+
+def queue_sentences(text):
+    """Queue every finished sentence in text for speech and return the unfinished rest"""
+    start = 0
+    for match in SENTENCE_END_RE.finditer(text):
+        sentence = text[start:match.end()].strip()
+        if sentence:
+            tts_queue.put(sentence)
+        start = match.end()
+    return text[start:]
+
+def tts_worker():
+    """Speak queued sentences one at a time"""
+    while True:
+        sentence = tts_queue.get()
+        try:
+            speak(sentence)
+        finally:
+            tts_queue.task_done()
+
+def stream_tts(cmd, text, samplerate, header_bytes=0):
+    """Pipe text into a TTS command and play its 16-bit mono PCM output as it arrives"""
+    global tts_process
+    try:
+        tts_process = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+        tts_process.stdin.write(text.encode() + b"\n")
+        tts_process.stdin.close()
+        tts_process.stdout.read(header_bytes)
+        with sd.RawOutputStream(samplerate=samplerate, channels=1, dtype='int16') as stream:
+            # Play each chunk as soon as the synthesizer writes it
+            while True:
+                buf = tts_process.stdout.read(PIPER_CHUNK)
+                if not buf:
+                    break
+                stream.write(buf)
+        # A missing model or binary error exits non-zero with no audio; let the caller fall back
+        if tts_process.wait() != 0:
+            raise subprocess.CalledProcessError(tts_process.returncode, cmd)
+    finally:
+        tts_process = None
+
 def speak(text):
-    """Convert text to speech using pyttsx3 with proper error handling"""
+    """Synthesize text with Piper and play the PCM as it is generated"""
     if not text.strip():
         return
     
     try:
-        init_tts()
-        if tts_engine and tts_engine is not False:
-            with SuppressTTSErrors():  # Suppress the callback errors
-                tts_engine.say(text)
-                tts_engine.runAndWait()
+        if not os.path.exists(PIPER_VOICE):
+            raise FileNotFoundError(f"Piper voice not found: {PIPER_VOICE}")
+        stream_tts(["piper", "--model", PIPER_VOICE, "--output-raw"], text, PIPER_SAMPLE_RATE)
     except Exception as e:
         print(f"🔇 TTS Error: {e}")
         # Fallback: try system TTS if available
@@ -89,72 +253,96 @@ def speak(text):
 def try_system_tts(text):
     """Fallback TTS using system commands"""
     try:
-        import subprocess
-        import platform
-        
-        system = platform.system()
-        if system == "Linux":
-            subprocess.run(["espeak", text], check=True, capture_output=True, stderr=subprocess.DEVNULL)
-        elif system == "Darwin":  # macOS
+        if SYSTEM == "Linux":
+            # espeak-ng writes a WAV stream to stdout; skip the header and play the samples
+            stream_tts(["espeak-ng", "--stdout"], text, ESPEAK_SAMPLE_RATE, ESPEAK_WAV_HEADER)
+        elif SYSTEM == "Darwin":  # macOS
             subprocess.run(["say", text], check=True)
-        elif system == "Windows":
-            subprocess.run([
-                "powershell", "-Command", 
-                f"Add-Type -AssemblyName System.Speech; (New-Object System.Speech.Synthesis.SpeechSynthesizer).Speak('{text}')"
-            ], check=True)
+        elif SYSTEM == "Windows":
+            # SAPI5 through pyttsx3 avoids a PowerShell cold start per sentence
+            import pyttsx3
+            engine = pyttsx3.init()
+            engine.say(text)
+            engine.runAndWait()
     except Exception:
         pass  # Silent fallback failure
 
-def chat_with_ollama(message, model="smollm2"):
+def chat_with_ollama(message, model=LLM_MODEL):
     print("🤖 AI: ", end='', flush=True)
-    full_response = []
+    pending = ""
+    reply_parts = []
+    print_buf = ""
+    last_print = time.monotonic()
+    HISTORY.append({'role': 'user', 'content': message})
+    del HISTORY[:-MAX_HISTORY_MESSAGES]
     
     try:
-        stream = ollama.chat(
+        stream = ollama_client.chat(
             model=model,
-            messages=[{'role': 'user', 'content': message}],
+            messages=HISTORY,
             stream=True,
+            options=LLM_OPTIONS,
+            keep_alive=LLM_KEEP_ALIVE,
         )
         
         for chunk in stream:
             content = chunk['message']['content']
-            print(content, end='', flush=True)
-            full_response.append(content)
-        
-        print()  # New line after streaming
+            reply_parts.append(content)
+            print_buf += content
+            now = time.monotonic()
+            if len(print_buf) >= PRINT_BATCH_CHARS or now - last_print >= PRINT_BATCH_SECONDS:
+                print(print_buf, end='', flush=True)
+                print_buf = ""
+                last_print = now
+            # Hand finished sentences to the TTS worker so speech starts before generation ends
+            pending = queue_sentences(pending + content)
         
-        # Speak the full response
-        response_text = ''.join(full_response)
-        if response_text.strip():
-            speak(response_text)
+        print(print_buf)  # rest of the reply, then a new line
+        if pending.strip():
+            tts_queue.put(pending.strip())
+        HISTORY.append({'role': 'assistant', 'content': ''.join(reply_parts)})
             
     except Exception as e:
+        HISTORY.pop()  # drop the unanswered question
         error_msg = f"Error communicating with Ollama: {e}"
         print(error_msg)
-        speak("Sorry, I encountered an error while processing your request.")
+        tts_queue.put("Sorry, I encountered an error while processing your request.")
+    tts_queue.join()
 
 def cleanup():
     """Clean up resources"""
-    global tts_engine
-    if tts_engine and tts_engine is not False:
-        try:
-            tts_engine.stop()
-        except:
-            pass
-        tts_engine = None
+    process = tts_process
+    if process is not None and process.poll() is None:
+        process.kill()
+
+def warm_up_model(model=LLM_MODEL):
+    """Load the model into Ollama now so the first reply is not a cold start"""
+    try:
+        ollama_client.generate(model=model, prompt="", keep_alive=LLM_KEEP_ALIVE,
+                               options=LLM_OPTIONS)
+    except ollama.ResponseError as e:
+        # Server is up but the model tag is missing
+        print(f"⚠️  Ollama warm-up failed: {e.error} (try: ollama pull {model})")
+    except Exception as e:
+        print(f"⚠️  Ollama warm-up failed, is the server running at {OLLAMA_HOST}? {e}")
 
 def main():
     print("🤖 Voice+Text smollm2 Chatbot (Ctrl+C to exit)")
-    print("📋 Make sure Ollama is running and smollm2 model is installed")
+    print(f"📋 Make sure Ollama is running and {LLM_MODEL} is installed")
+    print(f"   ollama pull {LLM_MODEL}")
     print("-" * 50)
+    threading.Thread(target=tts_worker, daemon=True).start()
+    # Load both models in the background while the menu is shown
+    threading.Thread(target=load_whisper_model, daemon=True).start()
+    threading.Thread(target=warm_up_model, daemon=True).start()
     
     try:
         while True:
             mode = input("\n[1] Voice input  [2] Text input  [q] Quit > ").strip().lower()
             
             if mode == '1':
-                record_audio()
-                message = transcribe_audio()
+                audio_data = record_audio()
+                message = transcribe_audio(audio_data)
                 if message:
                     chat_with_ollama(message)
                     